@@ -8,6 +8,8 @@ import numpy as np
 from typing import Optional, List, Dict, Tuple
 import logging
 
+from indicators_numba import pivot_kernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,24 +31,25 @@ class Indicators:
     def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range"""
         try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
+            high = df['high'].to_numpy()
+            low = df['low'].to_numpy()
+            prev_close = df['close'].shift().to_numpy()
             
-            # Calculate True Range
+            # Calculate True Range (fmax skips the missing previous close on the first bar)
             tr1 = high - low
-            tr2 = abs(high - close.shift())
-            tr3 = abs(low - close.shift())
+            tr2 = np.abs(high - prev_close)
+            tr3 = np.abs(low - prev_close)
             
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+            tr = pd.Series(np.fmax(np.fmax(tr1, tr2), tr3), index=df.index)
             
-            # Calculate ATR
-            atr = tr.rolling(window=period).mean()
+            # Calculate ATR (undefined until the first full period)
+            atr = pd.Series(np.nan, index=df.index)
             
-            # Use EMA for first period
-            atr.iloc[period-1] = tr.iloc[:period].mean()
-            for i in range(period, len(atr)):
-                atr.iloc[i] = (atr.iloc[i-1] * (period - 1) + tr.iloc[i]) / period
+            # Wilder smoothing seeded with the SMA of the first period
+            # (same recursion as an EMA with alpha = 1/period, run in one call)
+            smoothed = tr.iloc[period-1:].copy()
+            smoothed.iloc[0] = tr.iloc[:period].mean()
+            atr.iloc[period-1:] = smoothed.ewm(alpha=1 / period, adjust=False).mean()
             
             return atr
             
@@ -69,48 +72,13 @@ class Indicators:
             if len(df) < left + right + 1:
                 return pivots
             
-            for i in range(left, len(df) - right):
-                # Check for pivot high
-                is_pivot_high = True
-                high_val = df['high'].iloc[i]
-                
-                # Check left side
-                for j in range(1, left + 1):
-                    if df['high'].iloc[i - j] >= high_val:
-                        is_pivot_high = False
-                        break
-                
-                # Check right side
-                if is_pivot_high:
-                    for j in range(1, right + 1):
-                        if df['high'].iloc[i + j] > high_val:
-                            is_pivot_high = False
-                            break
-                
-                if is_pivot_high:
-                    #pivots['pivot_high'].iloc[i] = high_val
-                    pivots.loc[i, "pivot_high"] = high_val
-                
-                # Check for pivot low
-                is_pivot_low = True
-                low_val = df['low'].iloc[i]
-                
-                # Check left side
-                for j in range(1, left + 1):
-                    if df['low'].iloc[i - j] <= low_val:
-                        is_pivot_low = False
-                        break
-                
-                # Check right side
-                if is_pivot_low:
-                    for j in range(1, right + 1):
-                        if df['low'].iloc[i + j] < low_val:
-                            is_pivot_low = False
-                            break
-                
-                if is_pivot_low:
-                    #pivots['pivot_low'].iloc[i] = low_val
-                    pivots.loc[i, "pivot_low"] = low_val
+            pivot_high, pivot_low = pivot_kernel(
+                df['high'].to_numpy(dtype=np.float64),
+                df['low'].to_numpy(dtype=np.float64),
+                left, right
+            )
+            pivots['pivot_high'] = pivot_high
+            pivots['pivot_low'] = pivot_low
             
             return pivots
             
@@ -133,31 +101,40 @@ class Indicators:
                 return order_blocks
             
             # Calculate average body size for reference
-            avg_body = df['body'].rolling(window=20, min_periods=5).mean()
-            
-            for i in range(lookback, len(df) - 1):
-                current_close = df['close'].iloc[i]
-                current_open = df['open'].iloc[i]
-                next_close = df['close'].iloc[i + 1]
-                next_open = df['open'].iloc[i + 1]
-                current_low = df['low'].iloc[i]
+            avg_body = df['body'].rolling(window=20, min_periods=5).mean().to_numpy()
+            
+            # Work on the raw column arrays; per-cell .iloc lookups dominate otherwise
+            opens = df['open'].to_numpy()
+            highs = df['high'].to_numpy()
+            lows = df['low'].to_numpy()
+            closes = df['close'].to_numpy()
+            
+            # Blocks older than `lookback` bars are discarded, so only scan
+            # the bars that can still produce a recent block
+            current_index = len(df) - 1
+            for i in range(max(lookback, current_index - lookback), current_index):
+                current_close = closes[i]
+                current_open = opens[i]
+                next_close = closes[i + 1]
+                next_open = opens[i + 1]
+                current_low = lows[i]
                 # Bullish Order Block: Last down candle before strong up move
                 if current_close < current_open:  # Down candle
                     # Check for strong bullish move after
                     # Safety check: ensure avg_body is valid and not zero
-                    if pd.notna(avg_body.iloc[i]) and avg_body.iloc[i] > 0 and next_close > next_open and \
-                       (next_close - next_open) > avg_body.iloc[i] * 1.5:
+                    if pd.notna(avg_body[i]) and avg_body[i] > 0 and next_close > next_open and \
+                       (next_close - next_open) > avg_body[i] * 1.5:
 
                         # Calculate move strength (avg_body already checked above)
-                        move_strength = abs(next_close - current_low) / avg_body.iloc[i]
+                        move_strength = abs(next_close - current_low) / avg_body[i]
 
                         if move_strength > 2:  # Strong move
                             ob = {
                                 'type': 'bullish',
                                 'index': i,
                                 'time': df.index[i],
-                                'high': df['high'].iloc[i],
-                                'low': df['low'].iloc[i],
+                                'high': highs[i],
+                                'low': lows[i],
                                 'zone_high': current_open,
                                 'zone_low': current_close,
                                 'strength': move_strength,
@@ -169,19 +146,19 @@ class Indicators:
                 elif current_close > current_open:  # Up candle
                     # Check for strong bearish move after
                     # Safety check: ensure avg_body is valid and not zero
-                    if pd.notna(avg_body.iloc[i]) and avg_body.iloc[i] > 0 and next_close < next_open and \
-                       (next_open - next_close) > avg_body.iloc[i] * 1.5:
+                    if pd.notna(avg_body[i]) and avg_body[i] > 0 and next_close < next_open and \
+                       (next_open - next_close) > avg_body[i] * 1.5:
 
-                        current_high = df['high'].iloc[i]
-                        move_strength = abs(current_high - next_close) / avg_body.iloc[i]
+                        current_high = highs[i]
+                        move_strength = abs(current_high - next_close) / avg_body[i]
                         
                         if move_strength > 2:  # Strong move
                             ob = {
                                 'type': 'bearish',
                                 'index': i,
                                 'time': df.index[i],
-                                'high': df['high'].iloc[i],
-                                'low': df['low'].iloc[i],
+                                'high': highs[i],
+                                'low': lows[i],
                                 'zone_high': current_close,
                                 'zone_low': current_open,
                                 'strength': move_strength,
@@ -189,19 +166,13 @@ class Indicators:
                             }
                             order_blocks.append(ob)
             
-            # Sort by strength and keep only recent strong ones
+            # Sort by strength (all blocks are already within `lookback` bars)
             order_blocks.sort(key=lambda x: x['strength'], reverse=True)
+            recent_blocks = order_blocks[:5]  # Keep top 5 most recent strong OBs
+            for ob in recent_blocks:
+                ob['age'] = current_index - ob['index']
             
-            # Filter out old order blocks (keep only last N bars)
-            recent_blocks = []
-            current_index = len(df) - 1
-            for ob in order_blocks:
-                age = current_index - ob['index']
-                if age <= lookback:
-                    ob['age'] = age
-                    recent_blocks.append(ob)
-            
-            return recent_blocks[:5]  # Return top 5 most recent strong OBs
+            return recent_blocks
             
         except Exception as e:
             logger.error(f"Error detecting order blocks: {e}")
@@ -229,24 +200,24 @@ class Indicators:
                 point_value = 0.01
 
             min_gap_size = min_gap_points * point_value
+            highs = df['high'].to_numpy()
+            lows = df['low'].to_numpy()
 
-            for i in range(2, len(df)):
-                # Get three consecutive candles
-                candle1 = df.iloc[i-2]
-                candle2 = df.iloc[i-1]
-                candle3 = df.iloc[i]
-                
+            # FVGs older than 50 bars are discarded, so only scan the recent ones
+            current_index = len(df) - 1
+            for i in range(max(2, current_index - 49), len(df)):
+                # Compare candle 3 (i) against candle 1 (i-2)
                 # Bullish FVG
-                if candle3['low'] > candle1['high']:
-                    gap_size = candle3['low'] - candle1['high']
+                if lows[i] > highs[i-2]:
+                    gap_size = lows[i] - highs[i-2]
                     
                     if gap_size >= min_gap_size:
                         fvg = {
                             'type': 'bullish',
                             'index': i-1,
                             'time': df.index[i-1],
-                            'gap_high': candle3['low'],
-                            'gap_low': candle1['high'],
+                            'gap_high': lows[i],
+                            'gap_low': highs[i-2],
                             'gap_size': gap_size,
                             'gap_points': gap_size / point_value,
                             'filled': False,
@@ -254,16 +225,16 @@ class Indicators:
                         fvgs.append(fvg)
                 
                 # Bearish FVG
-                elif candle3['high'] < candle1['low']:
-                    gap_size = candle1['low'] - candle3['high']
+                elif highs[i] < lows[i-2]:
+                    gap_size = lows[i-2] - highs[i]
                     
                     if gap_size >= min_gap_size:
                         fvg = {
                             'type': 'bearish',
                             'index': i-1,
                             'time': df.index[i-1],
-                            'gap_high': candle1['low'],
-                            'gap_low': candle3['high'],
+                            'gap_high': lows[i-2],
+                            'gap_low': highs[i],
                             'gap_size': gap_size,
                             'gap_points': gap_size / point_value,
                             'filled': False,
@@ -282,16 +253,12 @@ class Indicators:
                     if current_price >= fvg['gap_low']:
                         fvg['filled'] = True
             
-            # Filter out filled FVGs and old ones
+            # Filter out filled FVGs (all are already from the last 50 bars)
             unfilled_fvgs = []
-            current_index = len(df) - 1
-            
             for fvg in fvgs:
                 if not fvg['filled']:
-                    age = current_index - fvg['index']
-                    if age <= 50:  # Keep FVGs from last 50 bars
-                        fvg['age'] = age
-                        unfilled_fvgs.append(fvg)
+                    fvg['age'] = current_index - fvg['index']
+                    unfilled_fvgs.append(fvg)
             
             # Sort by gap size (larger gaps are stronger)
             unfilled_fvgs.sort(key=lambda x: x['gap_size'], reverse=True)
@@ -372,41 +339,47 @@ class Indicators:
             recent_highs = pivots['pivot_high'].dropna().tail(10)
             recent_lows = pivots['pivot_low'].dropna().tail(10)
             
+            highs = df['high'].to_numpy()
+            lows = df['low'].to_numpy()
+            closes = df['close'].to_numpy()
+            
             # Check last few bars for sweeps
             for i in range(max(0, len(df) - 5), len(df)):
-                bar = df.iloc[i]
+                bar_high = highs[i]
+                bar_low = lows[i]
+                bar_close = closes[i]
                 
                 # Check for sweep of pivot highs
                 for idx, pivot_high in recent_highs.items():
-                    if bar['high'] > pivot_high and \
-                       bar['high'] <= pivot_high + sweep_distance and \
-                       bar['close'] < pivot_high:
+                    if bar_high > pivot_high and \
+                       bar_high <= pivot_high + sweep_distance and \
+                       bar_close < pivot_high:
                         
                         sweep = {
                             'type': 'bearish_sweep',
                             'index': i,
                             'time': df.index[i],
                             'pivot_level': pivot_high,
-                            'sweep_high': bar['high'],
-                            'sweep_distance': bar['high'] - pivot_high,
-                            'rejected': bar['close'] < pivot_high,
+                            'sweep_high': bar_high,
+                            'sweep_distance': bar_high - pivot_high,
+                            'rejected': bar_close < pivot_high,
                         }
                         sweeps.append(sweep)
                 
                 # Check for sweep of pivot lows
                 for idx, pivot_low in recent_lows.items():
-                    if bar['low'] < pivot_low and \
-                       bar['low'] >= pivot_low - sweep_distance and \
-                       bar['close'] > pivot_low:
+                    if bar_low < pivot_low and \
+                       bar_low >= pivot_low - sweep_distance and \
+                       bar_close > pivot_low:
                         
                         sweep = {
                             'type': 'bullish_sweep',
                             'index': i,
                             'time': df.index[i],
                             'pivot_level': pivot_low,
-                            'sweep_low': bar['low'],
-                            'sweep_distance': pivot_low - bar['low'],
-                            'rejected': bar['close'] > pivot_low,
+                            'sweep_low': bar_low,
+                            'sweep_distance': pivot_low - bar_low,
+                            'rejected': bar_close > pivot_low,
                         }
                         sweeps.append(sweep)
             
@@ -423,11 +396,12 @@ class Indicators:
         """
         try:
             levels = {}
+            hours = df.index.hour.to_numpy()  # Extracted once for all sessions
             
             for session_name, times in session_times.items():
                 # Filter bars within session
-                session_mask = (df.index.hour >= times['start_hour']) & \
-                             (df.index.hour < times['end_hour'])
+                session_mask = (hours >= times['start_hour']) & \
+                             (hours < times['end_hour'])
                 
                 session_bars = df[session_mask]
                 
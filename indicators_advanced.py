@@ -13,6 +13,32 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _killzone_at(hour: int, minute: int) -> Optional[str]:
+    """Killzone active at a UTC wall-clock time, earlier windows win on overlap"""
+    # Asian Killzone (20:00-23:00 UTC)
+    if 20 <= hour < 23:
+        return "asian_killzone"
+
+    # London Killzone (02:00-05:00 UTC)
+    if 2 <= hour < 5:
+        return "london_killzone"
+
+    # NY AM Killzone (13:30-16:00 UTC)
+    if (hour == 13 and minute >= 30) or (14 <= hour < 16):
+        return "ny_am_killzone"
+
+    # NY PM Killzone (18:30-21:00 UTC)
+    if (hour == 18 and minute >= 30) or (19 <= hour < 21):
+        return "ny_pm_killzone"
+
+    return None
+
+
+# Killzone boundaries all fall on the half hour, so one lookup per
+# half-hour slot of the day replaces the range checks
+_KILLZONE_BY_HALF_HOUR = tuple(_killzone_at(slot // 2, (slot % 2) * 30) for slot in range(48))
+
+
 @dataclass
 class PremiumDiscountZone:
     """Premium/Discount zone based on 50% equilibrium"""
@@ -324,26 +350,8 @@ class AdvancedSMCIndicators:
         - NY PM Killzone: 13:30-16:00 EST
         """
         try:
-            hour = current_time.hour
-            minute = current_time.minute
-
-            # Asian Killzone (20:00-23:00 UTC)
-            if 20 <= hour < 23:
-                return True, "asian_killzone"
-
-            # London Killzone (02:00-05:00 UTC)
-            if 2 <= hour < 5:
-                return True, "london_killzone"
-
-            # NY AM Killzone (13:30-16:00 UTC)
-            if (hour == 13 and minute >= 30) or (14 <= hour < 16):
-                return True, "ny_am_killzone"
-
-            # NY PM Killzone (18:30-21:00 UTC)
-            if (hour == 18 and minute >= 30) or (19 <= hour < 21):
-                return True, "ny_pm_killzone"
-
-            return False, None
+            killzone = _KILLZONE_BY_HALF_HOUR[current_time.hour * 2 + (current_time.minute >= 30)]
+            return killzone is not None, killzone
 
         except Exception as e:
             logger.error(f"Error checking silver bullet time: {e}")
@@ -0,0 +1,275 @@
+"""
+Compiled numeric kernels for the indicator paths
+Mirrors the pivot detection from indicators.py and the premium/discount,
+order flow, volume profile and power of three math from indicators_advanced.py
+on raw float64 arrays
+"""
+
+import numpy as np
+import logging
+from typing import NamedTuple
+
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logging.warning("numba not available, using pure Python kernels. Install with: pip install numba")
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels below still run uncompiled"""
+        def decorator(func):
+            return func
+        return decorator
+
+logger = logging.getLogger(__name__)
+
+# Codes returned by enhance_kernel (index into these tuples)
+FLOW_NAMES = ('neutral', 'bullish_institutional', 'bearish_institutional')
+PHASE_NAMES = ('unknown', 'accumulation', 'manipulation', 'distribution')
+
+# Pass as the volume array when the bars carry no tick volume
+NO_VOLUME = np.empty(0, dtype=np.float64)
+
+
+class Enhancement(NamedTuple):
+    """
+    Named fields of the enhance_kernel result
+    Field order is the kernel's return order; build with Enhancement._make(...)
+    """
+    equilibrium: float
+    ote_buy_low: float
+    ote_buy_high: float
+    ote_sell_low: float
+    ote_sell_high: float
+    poc: float
+    vah: float
+    val: float
+    flow_code: float
+    flow_strength: float
+    phase_code: float
+    phase_confidence: float
+    range_high: float
+    range_low: float
+
+# Explicit signature compiles at import time instead of on the first analysis tick.
+# Arrays are typed read-only so pandas column views can be passed without copying
+# (writable arrays are accepted too)
+if NUMBA_AVAILABLE:
+    _ARRAY = types.Array(types.float64, 1, 'A', readonly=True)
+    _ENHANCE_SIGNATURE = types.UniTuple(types.float64, 14)(_ARRAY, _ARRAY, _ARRAY, _ARRAY, _ARRAY)
+    _PIVOT_SIGNATURE = types.UniTuple(types.float64[::1], 2)(_ARRAY, _ARRAY, types.int64, types.int64)
+else:
+    _ENHANCE_SIGNATURE = None
+    _PIVOT_SIGNATURE = None
+
+
+@njit(_PIVOT_SIGNATURE, cache=True)
+def pivot_kernel(high, low, left, right):
+    """
+    Mark pivot highs/lows: bars strictly above (below) the `left` bars before
+    them and not exceeded by the `right` bars after them
+
+    Returns (pivot_high, pivot_low) arrays, NaN where there is no pivot
+    """
+    n = high.shape[0]
+    pivot_high = np.full(n, np.nan)
+    pivot_low = np.full(n, np.nan)
+
+    for i in range(left, n - right):
+        high_val = high[i]
+        is_pivot_high = True
+        for j in range(1, left + 1):
+            if high[i - j] >= high_val:
+                is_pivot_high = False
+                break
+        if is_pivot_high:
+            for j in range(1, right + 1):
+                if high[i + j] > high_val:
+                    is_pivot_high = False
+                    break
+        if is_pivot_high:
+            pivot_high[i] = high_val
+
+        low_val = low[i]
+        is_pivot_low = True
+        for j in range(1, left + 1):
+            if low[i - j] <= low_val:
+                is_pivot_low = False
+                break
+        if is_pivot_low:
+            for j in range(1, right + 1):
+                if low[i + j] < low_val:
+                    is_pivot_low = False
+                    break
+        if is_pivot_low:
+            pivot_low[i] = low_val
+
+    return pivot_high, pivot_low
+
+
+@njit(_ENHANCE_SIGNATURE, cache=True)
+def enhance_kernel(high, low, close, open_, volume):
+    """
+    Compute all numeric signal enhancements in one pass over the bars
+    An empty volume array means the bars carry no tick volume
+
+    Returns a plain tuple in Enhancement field order
+    """
+    n = high.shape[0]
+    has_volume = volume.shape[0] == n
+
+    # Range of the whole window
+    range_high = -np.inf
+    range_low = np.inf
+    for i in range(n):
+        if high[i] > range_high:
+            range_high = high[i]
+        if low[i] < range_low:
+            range_low = low[i]
+
+    # Premium/Discount and OTE levels
+    range_size = range_high - range_low
+    equilibrium = range_low + (range_size * 0.5)
+    ote_buy_low = range_low + (range_size * 0.62)
+    ote_buy_high = range_low + (range_size * 0.79)
+    ote_sell_high = range_high - (range_size * 0.62)
+    ote_sell_low = range_high - (range_size * 0.79)
+
+    # Institutional order flow over the last 20 bars
+    flow_code = 0.0
+    flow_strength = 0.0
+    if n >= 20:
+        start = n - 20
+        avg_volume = 0.0
+        recent_volume = 0.0
+        if has_volume:
+            for i in range(start, n):
+                avg_volume += volume[i]
+            avg_volume /= 20
+            for i in range(n - 5, n):
+                recent_volume += volume[i]
+            recent_volume /= 5
+
+        # Body to wick ratio; 0/0 bars are skipped, x/0 bars count as 0
+        ratio_sum = 0.0
+        ratio_count = 0
+        for i in range(start, n):
+            body = abs(close[i] - open_[i])
+            wick = (high[i] - low[i]) - body
+            if wick != 0:
+                ratio_sum += body / wick
+                ratio_count += 1
+            elif body != 0:
+                ratio_count += 1
+        body_wick_ratio = ratio_sum / ratio_count if ratio_count > 0 else 0.0
+
+        momentum = (close[n - 1] - close[start]) / close[start]
+        volume_surge = recent_volume / avg_volume if avg_volume > 0 else 1.0
+
+        if momentum > 0.005 and volume_surge > 1.5 and body_wick_ratio > 0.6:
+            flow_code = 1.0
+            flow_strength = min(momentum * volume_surge * body_wick_ratio, 10.0)
+        elif momentum < -0.005 and volume_surge > 1.5 and body_wick_ratio > 0.6:
+            flow_code = 2.0
+            flow_strength = min(abs(momentum) * volume_surge * body_wick_ratio, 10.0)
+
+    # Volume profile over the whole window
+    poc = 0.0
+    vah = 0.0
+    val = 0.0
+    if n >= 20 and has_volume:
+        if range_size == 0:
+            poc = close[n - 1]
+            vah = range_high
+            val = range_low
+        else:
+            bins = 20
+            bin_size = range_size / bins
+            volume_at_price = np.zeros(bins)
+
+            for i in range(n):
+                low_bin = int((low[i] - range_low) / bin_size)
+                high_bin = int((high[i] - range_low) / bin_size)
+                low_bin = max(0, min(bins - 1, low_bin))
+                high_bin = max(0, min(bins - 1, high_bin))
+
+                share = volume[i] / (high_bin - low_bin + 1)
+                for b in range(low_bin, high_bin + 1):
+                    volume_at_price[b] += share
+
+            poc_bin = np.argmax(volume_at_price)
+            target_volume = volume_at_price.sum() * 0.70
+
+            # Expand from POC towards the heavier side until 70% is covered
+            accumulated_volume = volume_at_price[poc_bin]
+            val_bin = poc_bin
+            vah_bin = poc_bin
+            while accumulated_volume < target_volume:
+                can_go_lower = val_bin > 0
+                can_go_higher = vah_bin < bins - 1
+
+                if not can_go_lower and not can_go_higher:
+                    break
+
+                if can_go_lower and (not can_go_higher or volume_at_price[val_bin - 1] > volume_at_price[vah_bin + 1]):
+                    val_bin -= 1
+                    accumulated_volume += volume_at_price[val_bin]
+                else:
+                    vah_bin += 1
+                    accumulated_volume += volume_at_price[vah_bin]
+
+            poc = range_low + (poc_bin + 0.5) * bin_size
+            vah = range_low + (vah_bin + 0.5) * bin_size
+            val = range_low + (val_bin + 0.5) * bin_size
+
+    # Power of Three over the last 30 bars
+    phase_code = 0.0
+    phase_confidence = 0.0
+    if n >= 30:
+        start = n - 30
+        recent_high = -np.inf
+        recent_low = np.inf
+        range_sum = 0.0
+        for i in range(start, n):
+            if high[i] > recent_high:
+                recent_high = high[i]
+            if low[i] < recent_low:
+                recent_low = low[i]
+            range_sum += high[i] - low[i]
+        price_range = recent_high - recent_low
+        avg_range = range_sum / 30
+
+        if price_range < avg_range * 1.5:
+            phase_code = 1.0
+            phase_confidence = 0.7
+        elif price_range > avg_range * 3:
+            # Wick to body ratio; 0/0 bars are skipped, x/0 bars are infinite
+            ratio_sum = 0.0
+            ratio_count = 0
+            infinite = False
+            for i in range(start, n):
+                body = abs(close[i] - open_[i])
+                wick = (high[i] - low[i]) - body
+                if body != 0:
+                    ratio_sum += wick / body
+                    ratio_count += 1
+                elif wick != 0:
+                    infinite = True
+            if infinite or (ratio_count > 0 and ratio_sum / ratio_count > 1.5):
+                phase_code = 2.0
+                phase_confidence = 0.8
+            else:
+                phase_code = 3.0
+                phase_confidence = 0.6
+        else:
+            if abs(close[n - 1] - close[start]) > avg_range * 2:
+                phase_code = 3.0
+                phase_confidence = 0.75
+            else:
+                phase_code = 1.0
+                phase_confidence = 0.5
+
+    return (equilibrium, ote_buy_low, ote_buy_high, ote_sell_low, ote_sell_high,
+            poc, vah, val, flow_code, flow_strength, phase_code, phase_confidence,
+            range_high, range_low)
@@ -14,14 +14,28 @@ This version integrates:
 import sys
 import os
 import time
+import heapq
+import queue
+import threading
 import signal
 import logging
+import re
+from collections import ChainMap
+from functools import lru_cache
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import yaml
 from dotenv import load_dotenv
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 # Load environment variables
 load_dotenv()
 
@@ -34,6 +48,7 @@ from persistence import Persistence
 
 # Import advanced modules
 from indicators_advanced import AdvancedSMCIndicators
+from indicators_numba import enhance_kernel, Enhancement, FLOW_NAMES, PHASE_NAMES, NO_VOLUME
 from risk_advanced import AdvancedRiskManager
 from position_manager_advanced import AdvancedPositionManager
 from small_capital_optimizer import SmallCapitalOptimizer
@@ -47,6 +62,143 @@ from order_manager import OrderManager
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class BarsView:
+    """Column arrays of a bars DataFrame, extracted once per fetch"""
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    open: np.ndarray
+    volume: np.ndarray  # empty when the bars carry no tick volume
+    time: np.ndarray
+
+    @classmethod
+    def from_df(cls, df) -> 'BarsView':
+        # Zero-copy views of the float64 columns; tick_volume is converted from uint64
+        return cls(
+            high=df['high'].to_numpy(dtype=np.float64),
+            low=df['low'].to_numpy(dtype=np.float64),
+            close=df['close'].to_numpy(dtype=np.float64),
+            open=df['open'].to_numpy(dtype=np.float64),
+            volume=df['tick_volume'].to_numpy(dtype=np.float64) if 'tick_volume' in df.columns else NO_VOLUME,
+            time=df.index.values.astype('datetime64[ns]'),
+        )
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """Account and positions fetched from MT5 at one point in time"""
+    account: Optional[Dict]
+    positions: List[Dict]
+    t: float  # time.monotonic() at fetch
+
+
+@dataclass(slots=True)
+class BotStats:
+    """Runtime counters updated from the main loop"""
+    start_time: datetime
+    signals_generated: int = 0
+    signals_filtered: int = 0
+    orders_placed: int = 0
+    positions_modified: int = 0
+    errors: int = 0
+    trades_today: int = 0
+    last_backup: Optional[float] = None  # time.monotonic() of the last database backup
+
+
+# Signals are written to the database in batches of up to this many rows,
+# or every SIGNAL_FLUSH_INTERVAL_SECONDS, whichever comes first
+SIGNAL_BATCH_SIZE = 50
+SIGNAL_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Reuse a snapshot for tasks that run within this many seconds of each other
+SNAPSHOT_TTL_SECONDS = 0.5
+
+# Reuse fetched bars for ticks within this many seconds of each other; short
+# enough that the forming bar's close stays current for the price checks
+BARS_CACHE_TTL_SECONDS = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class BotSettings:
+    """Config values read on every loop iteration, resolved once from the YAML dict"""
+    symbol: str
+    magic: int
+    mode: str
+    risk_pct_per_trade: float
+    close_on_safe_mode: bool
+    loop_interval_seconds: float
+    maintenance_interval_seconds: float
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'BotSettings':
+        system = config.get('system', {})
+        return cls(
+            symbol=config.get('symbol', 'BTCUSD'),
+            magic=config.get('magic', 0),
+            mode=config.get('mode', 'demo'),
+            risk_pct_per_trade=config.get('risk_pct_per_trade', 0.5),
+            close_on_safe_mode=config.get('close_on_safe_mode', False),
+            loop_interval_seconds=system.get('loop_interval_seconds', 1),
+            maintenance_interval_seconds=system.get('maintenance_interval_seconds', 300),
+        )
+
+
+# Emoji -> ASCII substitutions for consoles that cannot encode them (Windows cp1252)
+_EMOJI_MAP = {
+    '🚀': '[START]',
+    '✓': '[OK]',
+    '✅': '[SUCCESS]',
+    '❌': '[FAIL]',
+    '⚠️': '[WARN]',
+    '📊': '[STATS]',
+    '💰': '$',
+    '📈': '[UP]',
+    '📉': '[DOWN]',
+    '🔔': '[ALERT]',
+    '⏰': '[TIME]',
+    '🎯': '[TARGET]',
+    '🔥': '[HOT]',
+    '💡': '[INFO]',
+    '🛑': '[STOP]',
+}
+
+# Any remaining emojis (Unicode ranges for emojis), stripped entirely
+_EMOJI_RANGES = (
+    (0x1F600, 0x1F64F),  # emoticons
+    (0x1F300, 0x1F5FF),  # symbols & pictographs
+    (0x1F680, 0x1F6FF),  # transport & map symbols
+    (0x1F1E0, 0x1F1FF),  # flags (iOS)
+    (0x02702, 0x027B0),  # dingbats
+    (0x024C2, 0x1F251),
+    (0x1F900, 0x1F9FF),  # supplemental symbols
+    (0x02500, 0x02BEF),  # chinese characters
+)
+
+
+@lru_cache(maxsize=None)
+def _emoji_translate_table() -> Dict[int, Optional[str]]:
+    """
+    str.translate table that strips every codepoint in _EMOJI_RANGES and
+    substitutes the named emojis in the same pass.
+    Built on first use (~125k entries) so only emoji-stripping consoles pay for it.
+    """
+    table: Dict[int, Optional[str]] = {}
+    for start, end in _EMOJI_RANGES:
+        table.update(dict.fromkeys(range(start, end + 1)))
+
+    for emoji, replacement in _EMOJI_MAP.items():
+        # Multi-codepoint emojis ('⚠️' = U+26A0 U+FE0F) map on their base
+        # character; the trailing variation selector is in a stripped range
+        table[ord(emoji[0])] = replacement
+
+    return table
+
+
+# Runs of non-ASCII characters, the only text the translate table can change
+_NON_ASCII_RE = re.compile('[^\x00-\x7f]+')
+
+
 class SafeConsoleFormatter(logging.Formatter):
     """
     Custom formatter that removes emojis on Windows to prevent UnicodeEncodeError.
@@ -56,60 +208,27 @@ class SafeConsoleFormatter(logging.Formatter):
         super().__init__(fmt, datefmt)
         self.remove_emojis = remove_emojis
 
-    def format(self, record):
-        # Format the message normally
+        # Pick the format path once instead of branching on every record
+        if remove_emojis:
+            self._emoji_table = _emoji_translate_table()
+            self.format = self._format_strip
+
+    def _format_strip(self, record):
+        # Format the message normally, then replace emojis with safe alternatives
         formatted = super().format(record)
+        if formatted.isascii():
+            return formatted
 
-        # On Windows console, replace emojis with safe alternatives
-        if self.remove_emojis:
-            # Replace common emojis with ASCII alternatives
-            emoji_map = {
-                '🚀': '[START]',
-                '✓': '[OK]',
-                '✅': '[SUCCESS]',
-                '❌': '[FAIL]',
-                '⚠️': '[WARN]',
-                '📊': '[STATS]',
-                '💰': '$',
-                '📈': '[UP]',
-                '📉': '[DOWN]',
-                '🔔': '[ALERT]',
-                '⏰': '[TIME]',
-                '🎯': '[TARGET]',
-                '🔥': '[HOT]',
-                '💡': '[INFO]',
-                '🛑': '[STOP]',
-            }
-
-            for emoji, replacement in emoji_map.items():
-                formatted = formatted.replace(emoji, replacement)
-
-            # Remove any remaining emojis (Unicode range for emojis)
-            import re
-            # Remove emoji characters
-            emoji_pattern = re.compile(
-                "["
-                "\U0001F600-\U0001F64F"  # emoticons
-                "\U0001F300-\U0001F5FF"  # symbols & pictographs
-                "\U0001F680-\U0001F6FF"  # transport & map symbols
-                "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-                "\U00002702-\U000027B0"  # dingbats
-                "\U000024C2-\U0001F251"
-                "\U0001F900-\U0001F9FF"  # supplemental symbols
-                "\U00002500-\U00002BEF"  # chinese characters
-                "]+",
-                flags=re.UNICODE
-            )
-            formatted = emoji_pattern.sub('', formatted)
+        # Translate only the non-ASCII runs: per-character table lookups over a
+        # whole line cost more than locating the few emoji runs in it
+        return _NON_ASCII_RE.sub(self._translate_run, formatted)
 
-        return formatted
+    def _translate_run(self, match: re.Match) -> str:
+        return match.group(0).translate(self._emoji_table)
 
 
 def setup_logging(config: Dict):
     """Setup logging configuration with full Windows compatibility"""
-    import sys
-    import re
-
     log_level = getattr(logging, config.get('system', {}).get('log_level', 'INFO'))
     log_dir = Path('./logs')
     log_dir.mkdir(exist_ok=True)
@@ -165,6 +284,7 @@ class AdvancedTradingBot:
     def __init__(self, config_file: str):
         """Initialize bot with configuration"""
         self.config = self._load_config(config_file)
+        self.settings = BotSettings.from_config(self.config)
         self.logger = setup_logging(self.config)
 
         self.logger.info("=" * 80)
@@ -191,20 +311,36 @@ class AdvancedTradingBot:
         self.shutdown_requested = False
 
         # Statistics
-        self.stats = {
-            'start_time': datetime.now(timezone.utc),
-            'signals_generated': 0,
-            'signals_filtered': 0,
-            'orders_placed': 0,
-            'positions_modified': 0,
-            'errors': 0,
-        }
+        self.stats = BotStats(start_time=datetime.now(timezone.utc))
+
+        # Bars cache: (timeframe, count) -> (fetch time, df), see _cached_bars()
+        self._bars_cache: Dict[Tuple[str, int], Tuple[float, object]] = {}
+
+        # Last advanced indicator results as (df, values), reused while the bars are unchanged
+        self._enhancement_cache: Optional[Tuple[object, Dict]] = None
+
+        # Write-behind buffer of (signal, status) pairs, see _queue_signal()
+        self._signal_queue: List[Tuple[Dict, str]] = []
+
+        # Shared account/positions snapshot, see _get_snapshot()
+        self._snapshot: Optional[Snapshot] = None
+
+        # Array view of the last bars DataFrame as (df, view)
+        self._bars_view_cache: Optional[Tuple[object, BarsView]] = None
+
+        # Telegram notifications are sent by a background worker so network
+        # round-trips never block the trading loop
+        self._notification_queue = queue.Queue(maxsize=256)
+        self._notification_thread = threading.Thread(
+            target=self._notification_worker, name="telegram-notifier", daemon=True
+        )
+        self._notification_thread.start()
 
     def _load_config(self, config_file: str) -> Dict:
         """Load configuration from YAML file"""
         try:
             with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlSafeLoader)
 
             # Override with environment variables
             if os.getenv('MT5_LOGIN'):
@@ -267,6 +403,7 @@ class AdvancedTradingBot:
             self.config['max_daily_loss_pct'] = loss_limits['daily']
             self.config['max_weekly_loss_pct'] = loss_limits.get('weekly', 5.0)
             self.config['max_monthly_loss_pct'] = loss_limits.get('monthly', 10.0)
+            self.settings = BotSettings.from_config(self.config)
 
             # Initialize advanced risk manager
             self.logger.info("✓ Initializing advanced risk manager...")
@@ -275,8 +412,8 @@ class AdvancedTradingBot:
 
             # Initialize advanced position manager
             self.logger.info("✓ Initializing advanced position manager...")
-            position_config = self.config.copy()
-            position_config.update({
+            # Overrides layered over the main config without copying it
+            position_config = ChainMap({
                 'enable_trailing_stop': True,
                 'trailing_activation_pct': pos_mgmt_params.get('trailing_activation', 1.0),
                 'trailing_distance_pct': pos_mgmt_params.get('trailing_distance', 0.5),
@@ -286,7 +423,7 @@ class AdvancedTradingBot:
                 'enable_partial_profit': True,
                 'partial_profit_levels': pos_mgmt_params.get('partial_profits', []),
                 'max_position_hold_hours': pos_mgmt_params.get('max_hold_hours', 24),
-            })
+            }, self.config)
             self.position_manager = AdvancedPositionManager(position_config)
 
             # Initialize Telegram notifier
@@ -322,10 +459,11 @@ class AdvancedTradingBot:
 
             # Send startup notification
             if self.telegram.config.enabled:
-                self.telegram.notify_bot_started_sync(
+                self._notify(
+                    'notify_bot_started_sync',
                     "Advanced Trading Bot",
                     {
-                        'symbols': [self.config.get('symbol', 'BTCUSD')],
+                        'symbols': [self.settings.symbol],
                         'risk_pct': optimized_risk,
                         'max_daily_loss': loss_limits['daily'],
                         'max_positions': self.config.get('max_concurrent_trades', 3),
@@ -354,37 +492,36 @@ class AdvancedTradingBot:
         signal.signal(signal.SIGTERM, self._signal_handler)
 
         # Main loop
-        tick_count = 0
-        analysis_interval = self.config.get('system', {}).get('loop_interval_seconds', 1)
-        maintenance_interval = self.config.get('system', {}).get('maintenance_interval_seconds', 300)
+        analysis_interval = self.settings.loop_interval_seconds
+        maintenance_interval = self.settings.maintenance_interval_seconds
         position_check_interval = 10  # Check positions every 10 seconds
 
-        last_analysis = time.time()
-        last_maintenance = time.time()
-        last_position_check = time.time()
+        # Min-heap of (next_due, order, interval, task); order breaks ties in
+        # the same sequence the tasks used to run within one pass
+        start = time.monotonic()
+        deadlines = [
+            (start + position_check_interval, 0, position_check_interval, self._check_positions),
+            (start + analysis_interval, 1, analysis_interval, self._perform_analysis),
+            (start + maintenance_interval, 2, maintenance_interval, self._perform_maintenance),
+            (start + SIGNAL_FLUSH_INTERVAL_SECONDS, 3, SIGNAL_FLUSH_INTERVAL_SECONDS, self._flush_signals),
+        ]
+        heapq.heapify(deadlines)
 
         while self.running and not self.shutdown_requested:
             try:
-                current_time = time.time()
-
-                # Check and update positions
-                if current_time - last_position_check >= position_check_interval:
-                    self._check_positions()
-                    last_position_check = current_time
+                due, order, interval, task = deadlines[0]
+                now = time.monotonic()
 
-                # Perform market analysis
-                if current_time - last_analysis >= analysis_interval:
-                    self._perform_analysis()
-                    last_analysis = current_time
-                    tick_count += 1
+                if due > now:
+                    # Sleep until the next deadline, capped so shutdown signals
+                    # are still noticed promptly (Windows only delivers them
+                    # between syscalls)
+                    time.sleep(min(due - now, 1.0))
+                    continue
 
-                # Perform maintenance
-                if current_time - last_maintenance >= maintenance_interval:
-                    self._perform_maintenance()
-                    last_maintenance = current_time
-
-                # Brief sleep
-                time.sleep(0.1)
+                # Reschedule before running so a failing task cannot spin
+                heapq.heapreplace(deadlines, (now + interval, order, interval, task))
+                task()
 
             except KeyboardInterrupt:
                 self.logger.info("Keyboard interrupt received")
@@ -392,9 +529,9 @@ class AdvancedTradingBot:
 
             except Exception as e:
                 self.logger.error(f"Error in main loop: {e}", exc_info=True)
-                self.stats['errors'] += 1
+                self.stats.errors += 1
 
-                if self.stats['errors'] > 10:
+                if self.stats.errors > 10:
                     self.logger.error("Too many errors, entering safe mode")
                     self._enter_safe_mode()
                     break
@@ -406,46 +543,57 @@ class AdvancedTradingBot:
     def _perform_analysis(self):
         """Perform market analysis with advanced features"""
         try:
-            mode = self.config.get('mode', 'demo')
+            mode = self.settings.mode
+            now_utc = datetime.now(timezone.utc)
 
             # Generate base signal
             signal = self.signal_engine.analyze()
 
             if signal:
-                self.stats['signals_generated'] += 1
-                self.logger.info(f"📊 Signal generated: {signal['side']} at {signal['entry_price']:.5f}")
+                self.stats.signals_generated += 1
+                self.logger.info("📊 Signal generated: %s at %.5f", signal['side'], signal['entry_price'])
+
+                # Get account info
+                account = self._get_snapshot().account
+                balance = account.get('balance', 0) if account else 0
+                daily_trades = self.stats.trades_today
+
+                # Cheap small capital checks first, before any indicator work
+                should_take, reason = self.small_cap_optimizer.should_take_cheap(
+                    signal, balance, daily_trades
+                )
+
+                if not should_take:
+                    self.logger.info("❌ Signal rejected by optimizer: %s", reason)
+                    self.stats.signals_filtered += 1
+                    self._queue_signal(signal, 'FILTERED_OPTIMIZER')
+                    return
 
                 # Get market data for advanced analysis
-                symbol = self.config.get('symbol', 'BTCUSD')
-                df = self.mt5_client.get_bars('M5', 100)
+                df = self._cached_bars('M5', 100)
 
                 if df is not None and len(df) > 0:
                     # Add advanced indicator analysis
-                    signal = self._enhance_signal_with_advanced_indicators(signal, df)
+                    signal = self._enhance_signal_with_advanced_indicators(signal, df, now_utc)
 
-                    # Get account info
-                    account = self.mt5_client.get_account_info()
-                    balance = account.get('balance', 0) if account else 0
-
-                    # Check with small capital optimizer
-                    daily_trades = self.stats.get('trades_today', 0)
-                    should_take, reason = self.small_cap_optimizer.should_take_signal(
+                    # Remaining small capital checks that need the indicator fields
+                    should_take, reason = self.small_cap_optimizer.should_take_full(
                         signal, balance, daily_trades
                     )
 
                     if not should_take:
-                        self.logger.info(f"❌ Signal rejected by optimizer: {reason}")
-                        self.stats['signals_filtered'] += 1
-                        self.persistence.save_signal(signal, status='FILTERED_OPTIMIZER')
+                        self.logger.info("❌ Signal rejected by optimizer: %s", reason)
+                        self.stats.signals_filtered += 1
+                        self._queue_signal(signal, 'FILTERED_OPTIMIZER')
                         return
 
                     # Signal passed all filters!
-                    self.logger.info(f"✅ Signal approved - proceeding to trade")
-                    self.persistence.save_signal(signal, status='APPROVED')
+                    self.logger.info("✅ Signal approved - proceeding to trade")
+                    self._queue_signal(signal, 'APPROVED')
 
                     # Send signal notification
                     if self.telegram.config.enabled and self.telegram.config.notify_signals:
-                        self.telegram.notify_signal_generated_sync(signal)
+                        self._notify('notify_signal_generated_sync', dict(signal))
 
                     # Process signal if not in dry run
                     if mode != 'dry_run':
@@ -458,13 +606,15 @@ class AdvancedTradingBot:
                                 lot_size = self._calculate_optimized_lot_size(signal, account)
                                 signal['lot_size'] = lot_size
 
-                                # Place order
+                                # Place order (its own signal writes must land after the queued APPROVED row)
+                                self._flush_signals()
                                 success, result = self.order_manager.process_signal(signal)
 
                                 if success:
-                                    self.stats['orders_placed'] += 1
-                                    self.stats['trades_today'] = self.stats.get('trades_today', 0) + 1
-                                    self.logger.info(f"✅ Order placed: {result.get('order')}")
+                                    self._snapshot = None
+                                    self.stats.orders_placed += 1
+                                    self.stats.trades_today += 1
+                                    self.logger.info("✅ Order placed: %s", result.get('order'))
 
                                     # Add position to tracker
                                     if result.get('filled'):
@@ -473,13 +623,13 @@ class AdvancedTradingBot:
                                         # Get current ATR for dynamic position management
                                         current_atr = 0.0
                                         try:
-                                            atr_df = self.mt5_client.get_bars('M5', 20)
+                                            atr_df = self._cached_bars('M5', 20)
                                             if atr_df is not None and len(atr_df) >= 14:
                                                 from indicators import Indicators
                                                 atr_series = Indicators.atr(atr_df, 14)
                                                 current_atr = atr_series.iloc[-1] if len(atr_series) > 0 else 0
                                         except Exception as e:
-                                            self.logger.debug(f"Could not get ATR for position: {e}")
+                                            self.logger.debug("Could not get ATR for position: %s", e)
 
                                         self.position_manager.add_position(
                                             ticket=ticket,
@@ -489,13 +639,13 @@ class AdvancedTradingBot:
                                             volume=lot_size,
                                             stop_loss=signal['sl_price'],
                                             take_profit=signal['tp_price'],
-                                            open_time=datetime.utcnow(),
+                                            open_time=now_utc,
                                             atr=current_atr
                                         )
 
                                     # Send trade notification
                                     if self.telegram.config.enabled:
-                                        self.telegram.notify_trade_opened_sync({
+                                        self._notify('notify_trade_opened_sync', {
                                             'symbol': signal['symbol'],
                                             'ticket': result.get('ticket', 0),
                                             'side': signal['side'],
@@ -503,13 +653,13 @@ class AdvancedTradingBot:
                                             'entry_price': signal['entry_price'],
                                             'stop_loss': signal['sl_price'],
                                             'take_profit': signal['tp_price'],
-                                            'risk_amount': balance * (self.config.get('risk_pct_per_trade', 0.5) / 100),
-                                            'risk_pct': self.config.get('risk_pct_per_trade', 0.5)
+                                            'risk_amount': balance * (self.settings.risk_pct_per_trade / 100),
+                                            'risk_pct': self.settings.risk_pct_per_trade
                                         })
                                 else:
-                                    self.logger.warning(f"❌ Order placement failed: {result.get('error')}")
+                                    self.logger.warning("❌ Order placement failed: %s", result.get('error'))
                             else:
-                                self.logger.warning(f"❌ Risk check failed: {risk_check.get('reason', 'Unknown')}")
+                                self.logger.warning("❌ Risk check failed: %s", risk_check.get('reason', 'Unknown'))
                     else:
                         self.logger.info("ℹ️ Dry run mode - order not placed")
 
@@ -519,75 +669,102 @@ class AdvancedTradingBot:
 
         except Exception as e:
             self.logger.error(f"Error in analysis: {e}", exc_info=True)
-            self.stats['errors'] += 1
-
-    def _enhance_signal_with_advanced_indicators(self, signal: Dict, df) -> Dict:
+            self.stats.errors += 1
+
+    def _cached_bars(self, timeframe: str, count: int):
+        """Get bars, re-fetching from MT5 once the cached ones are older than BARS_CACHE_TTL_SECONDS"""
+        key = (timeframe, count)
+        now = time.monotonic()
+
+        cached = self._bars_cache.get(key)
+        if cached is not None and now - cached[0] <= BARS_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        # get_bars itself only fetches the bars newer than its last result
+        df = self.mt5_client.get_bars(timeframe, count)
+        if df is not None:
+            self._bars_cache[key] = (now, df)
+        else:
+            self._bars_cache.pop(key, None)
+        return df
+
+    def _bars_view(self, df) -> BarsView:
+        """Get the array view of a bars DataFrame, built once per DataFrame"""
+        cached = self._bars_view_cache
+        if cached is not None and cached[0] is df:
+            return cached[1]
+
+        bars = BarsView.from_df(df)
+        self._bars_view_cache = (df, bars)
+        return bars
+
+    def _enhance_signal_with_advanced_indicators(self, signal: Dict, df,
+                                                 now_utc: Optional[datetime] = None) -> Dict:
         """Enhance signal with advanced SMC/ICT indicators"""
         try:
-            # Calculate premium/discount zones
-            high = df['high'].max()
-            low = df['low'].min()
-            pd_zone = self.advanced_indicators.calculate_premium_discount(high, low)
-
-            if pd_zone:
-                current_price = df['close'].iloc[-1]
-                signal['in_premium'] = current_price > pd_zone.equilibrium
-                signal['in_discount'] = current_price < pd_zone.equilibrium
-                signal['in_ote_buy'] = pd_zone.ote_buy_low <= current_price <= pd_zone.ote_buy_high
-                signal['in_ote_sell'] = pd_zone.ote_sell_low <= current_price <= pd_zone.ote_sell_high
-
-            # Detect market structure (BOS/CHoCH)
-            market_structure = self.advanced_indicators.detect_bos_choch(df)
-            signal['bos'] = market_structure.bos
-            signal['choch'] = market_structure.choch
-            signal['mss'] = market_structure.mss
+            # Bar-derived values only change when the bars do
+            cached = self._enhancement_cache
+            if cached is not None and cached[0] is df:
+                values = cached[1]
+            else:
+                values = self._calculate_advanced_indicators(df)
+                self._enhancement_cache = (df, values)
+            signal.update(values)
 
             # Check kill zone timing
-            is_killzone, killzone_name = self.advanced_indicators.is_silver_bullet_time(datetime.utcnow())
+            is_killzone, killzone_name = self.advanced_indicators.is_silver_bullet_time(now_utc or datetime.now(timezone.utc))
             signal['in_killzone'] = is_killzone
             signal['killzone'] = killzone_name
 
-            # Institutional order flow
-            order_flow = self.advanced_indicators.calculate_institutional_order_flow(df)
-            signal['order_flow'] = order_flow['flow']
-            signal['order_flow_strength'] = order_flow['strength']
-
-            # Volume profile
-            vol_profile = self.advanced_indicators.calculate_volume_profile(df)
-            signal['volume_poc'] = vol_profile.get('poc', 0)
-            signal['volume_vah'] = vol_profile.get('vah', 0)
-            signal['volume_val'] = vol_profile.get('val', 0)
-
-            # Power of Three phase
-            power_of_3 = self.advanced_indicators.calculate_power_of_three(df)
-            signal['market_phase'] = power_of_3['phase']
-            signal['phase_confidence'] = power_of_3['confidence']
-
             return signal
 
         except Exception as e:
             self.logger.error(f"Error enhancing signal: {e}")
             return signal
 
+    def _calculate_advanced_indicators(self, df) -> Dict:
+        """Calculate the bar-derived SMC/ICT values used to enhance signals"""
+        # Numeric enhancements in one compiled pass over the raw arrays
+        bars = self._bars_view(df)
+        current_price = bars.close[-1]
+        enh = Enhancement._make(
+            enhance_kernel(bars.high, bars.low, bars.close, bars.open, bars.volume)
+        )
+
+        # Detect market structure (BOS/CHoCH)
+        market_structure = self.advanced_indicators.detect_bos_choch(df)
+
+        return {
+            # Premium/discount zones
+            'in_premium': current_price > enh.equilibrium,
+            'in_discount': current_price < enh.equilibrium,
+            'in_ote_buy': enh.ote_buy_low <= current_price <= enh.ote_buy_high,
+            'in_ote_sell': enh.ote_sell_low <= current_price <= enh.ote_sell_high,
+            'bos': market_structure.bos,
+            'choch': market_structure.choch,
+            'mss': market_structure.mss,
+            # Institutional order flow
+            'order_flow': FLOW_NAMES[int(enh.flow_code)],
+            'order_flow_strength': enh.flow_strength,
+            # Volume profile
+            'volume_poc': enh.poc,
+            'volume_vah': enh.vah,
+            'volume_val': enh.val,
+            # Power of Three phase
+            'market_phase': PHASE_NAMES[int(enh.phase_code)],
+            'phase_confidence': enh.phase_confidence,
+        }
+
     def _calculate_optimized_lot_size(self, signal: Dict, account: Dict) -> float:
         """Calculate lot size using advanced risk management"""
         try:
             balance = account.get('balance', 0)
 
-            # Get trade history for Kelly
-            recent_trades = self.risk_manager.trade_history[-20:] if len(self.risk_manager.trade_history) >= 20 else []
-
-            if len(recent_trades) >= 20:
-                wins = [t for t in recent_trades if t['is_win']]
-                losses = [t for t in recent_trades if not t['is_win']]
-
-                win_rate = len(wins) / len(recent_trades)
-                avg_win = abs(sum(t['profit'] for t in wins) / len(wins)) if wins else 0
-                avg_loss = abs(sum(t['profit'] for t in losses) / len(losses)) if losses else 0
-            else:
-                win_rate = None
-                avg_win = None
-                avg_loss = None
+            # Rolling Kelly inputs (None until enough trades are recorded)
+            kelly_stats = self.risk_manager.kelly_stats
+            win_rate = kelly_stats.win_rate
+            avg_win = kelly_stats.avg_win
+            avg_loss = kelly_stats.avg_loss
 
             # Calculate position size with Kelly
             position_risk = self.risk_manager.calculate_position_size(
@@ -614,43 +791,55 @@ class AdvancedTradingBot:
     def _check_positions(self):
         """Check and manage all open positions"""
         try:
-            positions = self.mt5_client.get_positions(symbol=self.config.get('symbol'))
+            # Snapshot positions are already limited to this bot's magic number
+            positions = self._get_snapshot().positions
+
+            if not positions:
+                return
+
+            # One ATR fetch serves every position in this pass
+            current_atr = None
+            if self.position_manager.use_dynamic_atr and self.position_manager.enable_trailing_stop:
+                current_atr = self.position_manager.get_current_atr(self.mt5_client)
 
+            # Evaluate all positions first, then execute the resulting actions
+            now_utc = datetime.now(timezone.utc)
+            pending_actions = []
             for pos in positions:
-                if pos.get('magic') == self.config.get('magic', 0):
-                    ticket = pos['ticket']
-                    current_price = pos.get('price_current', 0)
+                action = self.position_manager.update_position(
+                    pos['ticket'], pos['price_current'], self.mt5_client, current_atr, now_utc
+                )
+                if action:
+                    pending_actions.append((pos, action))
 
-                    # Update position manager
-                    action = self.position_manager.update_position(
-                        ticket, current_price, self.mt5_client
-                    )
+            for pos, action in pending_actions:
+                ticket = pos['ticket']
 
-                    if action:
-                        # Execute the action
-                        success = self.position_manager.execute_position_action(
-                            action, self.mt5_client
-                        )
+                # Execute the action
+                success = self.position_manager.execute_position_action(
+                    action, self.mt5_client
+                )
 
-                        if success:
-                            self.stats['positions_modified'] += 1
-                            self.logger.info(f"✅ Position {ticket} modified: {action['action']}")
-
-                            # Send notification
-                            if self.telegram.config.enabled:
-                                # Calculate profit percentage safely
-                                position_value = pos.get('volume', 0) * pos.get('price_open', 1)
-                                profit_pct = (pos.get('profit', 0) / position_value * 100) if position_value > 0 else 0
-
-                                self.telegram.notify_position_modified_sync({
-                                    'ticket': ticket,
-                                    'symbol': pos['symbol'],
-                                    'type': action['reason'],
-                                    'new_sl': action.get('new_sl'),
-                                    'closed_volume': action.get('volume'),
-                                    'profit': pos.get('profit', 0),
-                                    'profit_pct': profit_pct
-                                })
+                if success:
+                    self._snapshot = None
+                    self.stats.positions_modified += 1
+                    self.logger.info("✅ Position %s modified: %s", ticket, action['action'])
+
+                    # Send notification
+                    if self.telegram.config.enabled:
+                        # Calculate profit percentage safely
+                        position_value = pos.get('volume', 0) * pos.get('price_open', 1)
+                        profit_pct = (pos.get('profit', 0) / position_value * 100) if position_value > 0 else 0
+
+                        self._notify('notify_position_modified_sync', {
+                            'ticket': ticket,
+                            'symbol': pos['symbol'],
+                            'type': action['reason'],
+                            'new_sl': action.get('new_sl'),
+                            'closed_volume': action.get('volume'),
+                            'profit': pos.get('profit', 0),
+                            'profit_pct': profit_pct
+                        })
 
         except Exception as e:
             self.logger.error(f"Error checking positions: {e}")
@@ -665,12 +854,14 @@ class AdvancedTradingBot:
             self.mt5_client._update_symbol_info()
 
             # Backup database
-            if time.time() - self.stats.get('last_backup', 0) > 3600:
+            now = time.monotonic()
+            last_backup = self.stats.last_backup
+            if last_backup is None or now - last_backup > 3600:
                 self.persistence.backup_database()
-                self.stats['last_backup'] = time.time()
+                self.stats.last_backup = now
 
             # Check risk limits
-            account = self.mt5_client.get_account_info()
+            account = self._get_snapshot().account
             if account:
                 balance = account.get('balance', 0)
 
@@ -681,7 +872,8 @@ class AdvancedTradingBot:
                     self._enter_safe_mode()
 
                     if self.telegram.config.enabled:
-                        self.telegram.notify_risk_limit_reached_sync(
+                        self._notify(
+                            'notify_risk_limit_reached_sync',
                             'auto_halt',
                             {'reason': reason, 'balance': balance}
                         )
@@ -692,38 +884,100 @@ class AdvancedTradingBot:
     def _log_status(self):
         """Log current status"""
         try:
-            uptime = (datetime.now(timezone.utc) - self.stats['start_time']).total_seconds()
+            # Skip the MT5 queries entirely when the line would be filtered out
+            if not self.logger.isEnabledFor(logging.INFO):
+                return
+
+            uptime = (datetime.now(timezone.utc) - self.stats.start_time).total_seconds()
             hours = int(uptime // 3600)
             minutes = int((uptime % 3600) // 60)
 
-            account = self.mt5_client.get_account_info()
-            positions = len(self.mt5_client.get_positions(symbol=self.config.get('symbol')))
+            snapshot = self._get_snapshot()
+            account = snapshot.account
+            positions = len(snapshot.positions)
 
             self.logger.info(
-                f"📊 Status - Uptime: {hours}h {minutes}m | "
-                f"Signals: {self.stats['signals_generated']} (filtered: {self.stats['signals_filtered']}) | "
-                f"Orders: {self.stats['orders_placed']} | "
-                f"Positions: {positions} | "
-                f"Balance: ${account.get('balance', 0):.2f} | "
-                f"Errors: {self.stats['errors']}"
+                "📊 Status - Uptime: %dh %dm | Signals: %d (filtered: %d) | Orders: %d | "
+                "Positions: %d | Balance: $%.2f | Errors: %d",
+                hours, minutes,
+                self.stats.signals_generated, self.stats.signals_filtered,
+                self.stats.orders_placed,
+                positions,
+                account.get('balance', 0),
+                self.stats.errors
             )
 
         except Exception as e:
             self.logger.error(f"Error logging status: {e}")
 
+    def _get_snapshot(self) -> Snapshot:
+        """Get account info and positions, refetched only once the last snapshot expires"""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is None or now - snapshot.t > SNAPSHOT_TTL_SECONDS:
+            snapshot = Snapshot(
+                account=self.mt5_client.get_account_info(),
+                positions=self.mt5_client.get_positions(
+                    symbol=self.settings.symbol, magic=self.settings.magic
+                ),
+                t=now,
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    def _queue_signal(self, signal: Dict, status: str):
+        """Buffer a signal for the next batched database write"""
+        self._signal_queue.append((dict(signal), status))
+        if len(self._signal_queue) >= SIGNAL_BATCH_SIZE:
+            self._flush_signals()
+
+    def _flush_signals(self):
+        """Write all buffered signals in one transaction"""
+        if not self._signal_queue or not self.persistence:
+            return
+
+        batch = self._signal_queue
+        self._signal_queue = []
+        self.persistence.save_signals_batch(batch)
+
+    def _notify(self, method_name: str, *args):
+        """Queue a Telegram notification for the background worker"""
+        try:
+            self._notification_queue.put_nowait((method_name, args))
+        except queue.Full:
+            self.logger.warning(f"Notification queue full, dropping {method_name}")
+
+    def _notification_worker(self):
+        """Send queued Telegram notifications until a None sentinel arrives"""
+        while True:
+            item = self._notification_queue.get()
+            if item is None:
+                # The notifier's event loop belongs to this thread
+                if self.telegram:
+                    self.telegram.close()
+                break
+
+            method_name, args = item
+            try:
+                getattr(self.telegram, method_name)(*args)
+            except Exception as e:
+                self.logger.error(f"Error sending notification {method_name}: {e}")
+
     def _enter_safe_mode(self):
         """Enter safe mode"""
         try:
             self.logger.warning("⚠️ Entering safe mode")
 
             self.order_manager.cancel_all_pending("Safe mode activated")
+            self._flush_signals()
 
-            if self.config.get('close_on_safe_mode', False):
+            if self.settings.close_on_safe_mode:
                 # Close all positions
-                positions = self.mt5_client.get_positions(symbol=self.config.get('symbol'))
+                positions = self.mt5_client.get_positions(
+                    symbol=self.settings.symbol, magic=self.settings.magic
+                )
                 for pos in positions:
-                    if pos.get('magic') == self.config.get('magic', 0):
-                        self.mt5_client.close_position(pos['ticket'])
+                    self.mt5_client.close_position(pos['ticket'])
 
             self.running = False
 
@@ -744,8 +998,16 @@ class AdvancedTradingBot:
             if self.order_manager:
                 self.order_manager.cancel_all_pending("Bot shutdown")
 
+            self._flush_signals()
             self._log_final_stats()
 
+            # Flush pending notifications before exiting
+            self._notification_queue.put(None)
+            self._notification_thread.join(timeout=10)
+
+            if self.persistence:
+                self.persistence.close()
+
             if self.mt5_client:
                 self.mt5_client.shutdown()
 
@@ -760,11 +1022,11 @@ class AdvancedTradingBot:
             self.logger.info("=" * 80)
             self.logger.info("📊 FINAL STATISTICS")
             self.logger.info("=" * 80)
-            self.logger.info(f"Signals Generated: {self.stats['signals_generated']}")
-            self.logger.info(f"Signals Filtered: {self.stats['signals_filtered']}")
-            self.logger.info(f"Orders Placed: {self.stats['orders_placed']}")
-            self.logger.info(f"Positions Modified: {self.stats['positions_modified']}")
-            self.logger.info(f"Errors: {self.stats['errors']}")
+            self.logger.info(f"Signals Generated: {self.stats.signals_generated}")
+            self.logger.info(f"Signals Filtered: {self.stats.signals_filtered}")
+            self.logger.info(f"Orders Placed: {self.stats.orders_placed}")
+            self.logger.info(f"Positions Modified: {self.stats.positions_modified}")
+            self.logger.info(f"Errors: {self.stats.errors}")
 
             # Get performance stats
             perf_stats = self.persistence.get_performance_stats(days=1)
@@ -8,35 +8,158 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timezone, timedelta
 import time
+import random
 import logging
-from typing import Optional, Dict, List, Tuple, Any
-from functools import wraps
+from typing import Optional, Dict, List, Tuple, Any, NamedTuple
+from functools import wraps, lru_cache
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
 import os
 
 logger = logging.getLogger(__name__)
 
+# MT5 constant lookups, built once at import
+_TF_MAP = {
+    'M1': mt5.TIMEFRAME_M1,
+    'M5': mt5.TIMEFRAME_M5,
+    'M15': mt5.TIMEFRAME_M15,
+    'M30': mt5.TIMEFRAME_M30,
+    'H1': mt5.TIMEFRAME_H1,
+    'H4': mt5.TIMEFRAME_H4,
+    'D1': mt5.TIMEFRAME_D1,
+}
 
-def retry_on_failure(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
-    """Decorator for retrying failed MT5 operations with exponential backoff"""
+_ORDER_TYPE_NAMES = {
+    mt5.ORDER_TYPE_BUY: 'BUY',
+    mt5.ORDER_TYPE_SELL: 'SELL',
+    mt5.ORDER_TYPE_BUY_LIMIT: 'BUY_LIMIT',
+    mt5.ORDER_TYPE_SELL_LIMIT: 'SELL_LIMIT',
+    mt5.ORDER_TYPE_BUY_STOP: 'BUY_STOP',
+    mt5.ORDER_TYPE_SELL_STOP: 'SELL_STOP',
+}
+
+_RETCODE_MESSAGES = {
+    mt5.TRADE_RETCODE_REQUOTE: "Requote",
+    mt5.TRADE_RETCODE_REJECT: "Request rejected",
+    mt5.TRADE_RETCODE_CANCEL: "Request cancelled",
+    mt5.TRADE_RETCODE_PLACED: "Order placed",
+    mt5.TRADE_RETCODE_DONE: "Request completed",
+    mt5.TRADE_RETCODE_DONE_PARTIAL: "Request partially completed",
+    mt5.TRADE_RETCODE_ERROR: "Request processing error",
+    mt5.TRADE_RETCODE_TIMEOUT: "Request timeout",
+    mt5.TRADE_RETCODE_INVALID: "Invalid request",
+    mt5.TRADE_RETCODE_INVALID_VOLUME: "Invalid volume",
+    mt5.TRADE_RETCODE_INVALID_PRICE: "Invalid price",
+    mt5.TRADE_RETCODE_INVALID_STOPS: "Invalid stops",
+    mt5.TRADE_RETCODE_TRADE_DISABLED: "Trade disabled",
+    mt5.TRADE_RETCODE_MARKET_CLOSED: "Market closed",
+    mt5.TRADE_RETCODE_NO_MONEY: "Not enough money",
+    mt5.TRADE_RETCODE_PRICE_CHANGED: "Price changed",
+    mt5.TRADE_RETCODE_PRICE_OFF: "No quotes",
+    mt5.TRADE_RETCODE_INVALID_EXPIRATION: "Invalid expiration",
+    mt5.TRADE_RETCODE_ORDER_CHANGED: "Order state changed",
+    mt5.TRADE_RETCODE_TOO_MANY_REQUESTS: "Too many requests",
+}
+
+# mt5.last_error() codes that retrying cannot fix (bad credentials/params,
+# terminal version or unsupported call); reconnect gives up on these
+_PERMANENT_ERROR_CODES = frozenset({
+    -2,  # RES_E_INVALID_PARAMS
+    -5,  # RES_E_INVALID_VERSION
+    -6,  # RES_E_AUTH_FAILED
+    -7,  # RES_E_UNSUPPORTED
+})
+
+
+# Hot-path constants and API functions bound once, so order placement,
+# position conversion and tick polling skip the per-call module lookups
+_ORDER_TYPE_BUY = mt5.ORDER_TYPE_BUY
+_ORDER_TYPE_SELL = mt5.ORDER_TYPE_SELL
+_TRADE_ACTION_DEAL = mt5.TRADE_ACTION_DEAL
+_TRADE_ACTION_MODIFY = mt5.TRADE_ACTION_MODIFY
+_TRADE_ACTION_REMOVE = mt5.TRADE_ACTION_REMOVE
+_TRADE_RETCODE_DONE = mt5.TRADE_RETCODE_DONE
+_symbol_info_tick = mt5.symbol_info_tick
+_order_send = mt5.order_send
+
+# Deal type that closes a position of the given type
+_CLOSE_ORDER_TYPE = {
+    mt5.ORDER_TYPE_BUY: mt5.ORDER_TYPE_SELL,
+    mt5.ORDER_TYPE_SELL: mt5.ORDER_TYPE_BUY,
+}
+
+
+class SymbolInfo(NamedTuple):
+    """Cached symbol specifications (MT5Client.symbol_info)"""
+    point: float
+    digits: int
+    contract_size: float
+    min_lot: float
+    max_lot: float
+    lot_step: float
+    tick_size: float
+    tick_value: float
+    spread: int
+    stops_level: int
+    freeze_level: int
+    inv_point: float
+    inv_lot_step: float
+
+
+@dataclass(slots=True)
+class Tick:
+    """Latest quote for the client's symbol (MT5Client.get_tick); spread is in points"""
+    time: datetime
+    bid: float
+    ask: float
+    last: float
+    volume: int
+    spread: float
+    time_msc: int
+
+
+@lru_cache(maxsize=1024)
+def _utc_from_timestamp(ts: int) -> datetime:
+    """
+    UTC datetime for an MT5 epoch-seconds timestamp
+    Position/order times repeat on every poll, so conversions are memoised
+    """
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def retry_on_failure(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0,
+                     max_delay: float = 30.0, jitter: float = 0.5):
+    """
+    Decorator for retrying failed MT5 operations with exponential backoff
+    
+    A None result or a connection-level exception (ConnectionError,
+    TimeoutError, RuntimeError) triggers a retry; any other exception is a
+    bug, not a transient failure, and propagates immediately. A first None is
+    retried straight away (usually an empty read right at a bar/tick
+    boundary); later retries wait. Each wait is capped at max_delay and
+    scaled by a random factor in [1 - jitter, 1 + jitter] so several bots
+    reconnecting to the terminal do not retry in lockstep.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            attempt = 0
-            current_delay = delay
-            
-            while attempt < max_attempts:
+            for attempt in range(max_attempts):
                 try:
                     result = func(*args, **kwargs)
-                    if result is not None or attempt == max_attempts - 1:
-                        return result
-                except Exception as e:
+                except (ConnectionError, TimeoutError, RuntimeError) as e:
                     logger.warning(f"{func.__name__} attempt {attempt + 1} failed: {e}")
                     if attempt == max_attempts - 1:
                         raise
+                else:
+                    if result is not None:
+                        return result
+                    if attempt == 0:
+                        logger.debug(f"{func.__name__} returned None, retrying immediately")
+                        continue
                 
-                time.sleep(current_delay)
-                current_delay *= backoff
-                attempt += 1
+                if attempt < max_attempts - 1:
+                    current_delay = min(delay * (backoff ** attempt), max_delay)
+                    time.sleep(current_delay * (1 + random.uniform(-jitter, jitter)))
             
             return None
         return wrapper
@@ -54,38 +177,66 @@ class MT5Client:
         self.symbol = config['symbol']
         self.connected = False
         self.symbol_info = None
-        self.last_tick = None
+        self.last_tick: Optional[Tick] = None
         self.connection_attempts = 0
         self.max_reconnect_attempts = config.get('reconnect_attempts', 5)
         self.reconnect_delay = config.get('reconnect_delay', 10)
+        self.snapshot_ttl = config.get('snapshot_ttl', 0.1)
+        self.tick_cache_ttl = config.get('tick_cache_ttl_s', 0.01)
+        self._tick_cache_ts = 0.0
+        self._snapshot_cache: Dict[Optional[str], Tuple[float, Dict]] = {}
+        self._bar_cache: Dict[Tuple[str, int], pd.DataFrame] = {}
+        
+        # Constant part of every close request; close_position adds the
+        # position-specific fields
+        self._close_template = {
+            'action': _TRADE_ACTION_DEAL,
+            'magic': config.get('magic', 0),
+            'comment': 'Close by bot',
+        }
+        
+        # Single worker: the MT5 API is not thread-safe, so background calls
+        # are serialised on one thread (see submit())
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mt5')
+        
+        # Resolve credentials once (environment variables win over config);
+        # initialize() runs again on every reconnect
+        mt5_config = config.get('mt5', {})
+        login = os.getenv('MT5_LOGIN') or mt5_config.get('login')
+        try:
+            self._login = int(login) if login else None
+        except ValueError:
+            logger.error(f"Invalid MT5 login: {login}")
+            self._login = None
+        self._password = os.getenv('MT5_PASSWORD') or mt5_config.get('password')
+        self._server = os.getenv('MT5_SERVER') or mt5_config.get('server')
+        self._path = os.getenv('MT5_PATH') or mt5_config.get('path')
         
     def initialize(self) -> bool:
         """Initialize MT5 connection with credentials from config or env vars"""
         try:
-            # Get credentials from environment variables or config
-            login = os.getenv('MT5_LOGIN') or self.config.get('mt5', {}).get('login')
-            password = os.getenv('MT5_PASSWORD') or self.config.get('mt5', {}).get('password')
-            server = os.getenv('MT5_SERVER') or self.config.get('mt5', {}).get('server')
-            path = os.getenv('MT5_PATH') or self.config.get('mt5', {}).get('path')
-            
-            if not all([login, password, server]):
+            if not all([self._login, self._password, self._server]):
                 logger.error("MT5 credentials not provided")
                 return False
             
-            # Initialize MT5
-            init_params = {}
-            if path:
-                init_params['path'] = path
+            # Reuse a terminal session that is still logged in to this account
+            if self._is_session_alive(self._login):
+                logger.info("MT5 terminal already connected, reusing session")
+            else:
+                # Initialize MT5
+                init_params = {}
+                if self._path:
+                    init_params['path'] = self._path
+                    
+                if not mt5.initialize(**init_params):
+                    self._handle_connect_error("initialize")
+                    return False
                 
-            if not mt5.initialize(**init_params):
-                logger.error(f"MT5 initialize failed: {mt5.last_error()}")
-                return False
-            
-            # Login to account
-            if not mt5.login(int(login), password=password, server=server):
-                logger.error(f"MT5 login failed: {mt5.last_error()}")
-                mt5.shutdown()
-                return False
+                # Login to account
+                if not mt5.login(self._login, password=self._password, server=self._server):
+                    self._handle_connect_error("login")
+                    mt5.shutdown()
+                    return False
             
             # Verify symbol is available
             if not self._validate_symbol():
@@ -105,6 +256,35 @@ class MT5Client:
             logger.error(f"MT5 initialization error: {e}")
             return False
     
+    def _handle_connect_error(self, stage: str):
+        """Log the last MT5 error and stop further reconnects if it is permanent"""
+        error = mt5.last_error()
+        logger.error(f"MT5 {stage} failed: {error}")
+        
+        if error and error[0] in _PERMANENT_ERROR_CODES:
+            logger.critical(f"MT5 {stage} error is not recoverable, disabling reconnection")
+            self.connection_attempts = self.max_reconnect_attempts
+    
+    def _is_session_alive(self, login: Optional[int] = None) -> bool:
+        """
+        Cheap liveness probe: terminal attached and connected to the trade
+        server, logged in to `login` (if given) and quoting the symbol
+        """
+        try:
+            terminal = mt5.terminal_info()
+            if terminal is None or not terminal.connected:
+                return False
+            
+            if login is not None:
+                account = mt5.account_info()
+                if account is None or account.login != login:
+                    return False
+            
+            return _symbol_info_tick(self.symbol) is not None
+            
+        except Exception:
+            return False
+    
     def _validate_symbol(self) -> bool:
         """Validate that the symbol exists and is tradeable"""
         symbol_info = mt5.symbol_info(self.symbol)
@@ -125,45 +305,57 @@ class MT5Client:
         """Cache symbol specifications"""
         info = mt5.symbol_info(self.symbol)
         if info:
-            self.symbol_info = {
-                'point': info.point,
-                'digits': info.digits,
-                'contract_size': info.trade_contract_size,
-                'min_lot': info.volume_min,
-                'max_lot': info.volume_max,
-                'lot_step': info.volume_step,
-                'tick_size': info.trade_tick_size,
-                'tick_value': info.trade_tick_value,
-                'spread': info.spread,
-                'stops_level': info.trade_stops_level,
-                'freeze_level': info.trade_freeze_level,
-            }
+            self.symbol_info = SymbolInfo(
+                point=info.point,
+                digits=info.digits,
+                contract_size=info.trade_contract_size,
+                min_lot=info.volume_min,
+                max_lot=info.volume_max,
+                lot_step=info.volume_step,
+                tick_size=info.trade_tick_size,
+                tick_value=info.trade_tick_value,
+                spread=info.spread,
+                stops_level=info.trade_stops_level,
+                freeze_level=info.trade_freeze_level,
+                # Reciprocals so the tick/order paths multiply instead of divide
+                inv_point=1.0 / info.point if info.point else 0.0,
+                inv_lot_step=1.0 / info.volume_step if info.volume_step else 0.0,
+            )
             logger.debug(f"Symbol info updated: {self.symbol_info}")
     
     @retry_on_failure(max_attempts=3)
     def get_bars(self, timeframe: str, count: int) -> Optional[pd.DataFrame]:
-        """Get historical bars with error handling"""
+        """
+        Get historical bars with error handling
+        
+        The last result per (timeframe, count) is kept; later calls only fetch
+        the bars opened since its last (possibly still forming) bar
+        """
         if not self.connected:
             if not self.reconnect():
                 return None
         
         try:
-            # Convert timeframe string to MT5 constant
-            tf_map = {
-                'M1': mt5.TIMEFRAME_M1,
-                'M5': mt5.TIMEFRAME_M5,
-                'M15': mt5.TIMEFRAME_M15,
-                'M30': mt5.TIMEFRAME_M30,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4,
-                'D1': mt5.TIMEFRAME_D1,
-            }
-            
-            timeframe_mt5 = tf_map.get(timeframe)
+            timeframe_mt5 = self._get_timeframe(timeframe)
             if not timeframe_mt5:
-                logger.error(f"Invalid timeframe: {timeframe}")
                 return None
             
+            key = (timeframe, count)
+            cached = self._bar_cache.get(key)
+            if cached is not None:
+                rates = self._copy_rates_since(timeframe_mt5, cached.index[-1].to_pydatetime())
+                # The range starts at the cached last bar, so a healthy reply is
+                # never empty; treat None/empty as a failure and refetch in full
+                if rates is None or len(rates) == 0:
+                    logger.warning(f"No bars received for {self.symbol} {timeframe} since {cached.index[-1]}")
+                    del self._bar_cache[key]
+                    return None
+                
+                df = pd.concat([cached.iloc[:-1], self._rates_to_df(rates)])
+                df = df[~df.index.duplicated(keep='last')].iloc[-count:]
+                self._bar_cache[key] = df
+                return df.copy(deep=False)
+            
             # Get bars from current position
             rates = mt5.copy_rates_from_pos(self.symbol, timeframe_mt5, 0, count)
             
@@ -171,48 +363,135 @@ class MT5Client:
                 logger.warning(f"No bars received for {self.symbol} {timeframe}")
                 return None
             
-            # Convert to DataFrame with proper datetime index
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s', utc=True)
-            df.set_index('time', inplace=True)
+            # Callers add indicator columns to the frame they get back, so
+            # hand out shallow copies and keep the cached one clean
+            df = self._rates_to_df(rates)
+            self._bar_cache[key] = df
+            return df.copy(deep=False)
+            
+        except Exception as e:
+            logger.error(f"Error getting bars: {e}")
+            return None
+    
+    @retry_on_failure(max_attempts=3)
+    def get_last_bar(self, timeframe: str) -> Optional[Dict]:
+        """
+        Get only the current (forming) bar as a dict, without building a
+        DataFrame; carries the same derived fields as get_bars
+        """
+        if not self.connected:
+            if not self.reconnect():
+                return None
+        
+        try:
+            timeframe_mt5 = self._get_timeframe(timeframe)
+            if not timeframe_mt5:
+                return None
+            
+            rates = mt5.copy_rates_from_pos(self.symbol, timeframe_mt5, 0, 1)
+            
+            if rates is None or len(rates) == 0:
+                logger.warning(f"No bars received for {self.symbol} {timeframe}")
+                return None
             
-            # Add calculated fields
-            df['hl2'] = (df['high'] + df['low']) / 2
-            df['hlc3'] = (df['high'] + df['low'] + df['close']) / 3
-            df['ohlc4'] = (df['open'] + df['high'] + df['low'] + df['close']) / 4
-            df['body'] = abs(df['close'] - df['open'])
-            df['upper_wick'] = df['high'] - df[['open', 'close']].max(axis=1)
-            df['lower_wick'] = df[['open', 'close']].min(axis=1) - df['low']
+            bar = rates[0]
+            o = float(bar['open'])
+            h = float(bar['high'])
+            l = float(bar['low'])
+            c = float(bar['close'])
             
-            return df
+            return {
+                'time': _utc_from_timestamp(int(bar['time'])),
+                'open': o,
+                'high': h,
+                'low': l,
+                'close': c,
+                'tick_volume': int(bar['tick_volume']),
+                'spread': int(bar['spread']),
+                'real_volume': int(bar['real_volume']),
+                'hl2': (h + l) / 2,
+                'hlc3': (h + l + c) / 3,
+                'ohlc4': (o + h + l + c) / 4,
+                'body': abs(c - o),
+                'upper_wick': h - max(o, c),
+                'lower_wick': min(o, c) - l,
+            }
             
         except Exception as e:
-            logger.error(f"Error getting bars: {e}")
+            logger.error(f"Error getting last bar: {e}")
             return None
     
+    def _copy_rates_since(self, timeframe_mt5: int, since: datetime):
+        """Raw rates for the bars opened at or after `since`"""
+        # Bar times are server time labelled as UTC and can run ahead of
+        # the real UTC clock, so leave generous headroom on the upper bound
+        date_to = datetime.now(timezone.utc) + timedelta(days=1)
+        return mt5.copy_rates_range(self.symbol, timeframe_mt5, since, date_to)
+    
+    def _get_timeframe(self, timeframe: str) -> Optional[int]:
+        """Convert timeframe string to MT5 constant"""
+        timeframe_mt5 = _TF_MAP.get(timeframe)
+        if not timeframe_mt5:
+            logger.error(f"Invalid timeframe: {timeframe}")
+        return timeframe_mt5
+    
+    def _rates_to_df(self, rates) -> pd.DataFrame:
+        """Convert MT5 rates to a DataFrame with datetime index and derived fields"""
+        # Derived fields straight from the structured array's column views, so
+        # the frame is built once and no row-wise DataFrame reductions run
+        o = rates['open']
+        h = rates['high']
+        l = rates['low']
+        c = rates['close']
+        
+        columns = {name: rates[name] for name in rates.dtype.names if name != 'time'}
+        columns['hl2'] = (h + l) / 2
+        columns['hlc3'] = (h + l + c) / 3
+        columns['ohlc4'] = (o + h + l + c) / 4
+        columns['body'] = np.fabs(np.subtract(c, o))
+        columns['upper_wick'] = h - np.maximum(o, c)
+        columns['lower_wick'] = np.minimum(o, c) - l
+        
+        # Proper datetime index
+        index = pd.to_datetime(rates['time'], unit='s', utc=True)
+        index.name = 'time'
+        df = pd.DataFrame(columns, index=index)
+        
+        return df
+    
     @retry_on_failure(max_attempts=3)
-    def get_tick(self) -> Optional[Dict]:
-        """Get current tick data"""
+    def get_tick(self) -> Optional[Tick]:
+        """
+        Get current tick data
+        
+        Calls within tick_cache_ttl_s seconds (config, default 0.01) of the last
+        successful fetch reuse that tick; set it to 0 to always query MT5
+        """
+        now = time.monotonic()
+        if self.last_tick is not None and now - self._tick_cache_ts < self.tick_cache_ttl:
+            return self.last_tick
+        
         if not self.connected:
             if not self.reconnect():
                 return None
         
         try:
-            tick = mt5.symbol_info_tick(self.symbol)
+            tick = _symbol_info_tick(self.symbol)
             if tick is None:
                 return None
             
-            tick_data = {
-                'time': datetime.fromtimestamp(tick.time, tz=timezone.utc),
-                'bid': tick.bid,
-                'ask': tick.ask,
-                'last': tick.last,
-                'volume': tick.volume,
-                'spread': (tick.ask - tick.bid) / self.symbol_info['point'] if self.symbol_info and self.symbol_info.get('point', 0) > 0 else 0,
-                'time_msc': tick.time_msc,
-            }
+            tick_data = Tick(
+                time=datetime.fromtimestamp(tick.time, tz=timezone.utc),
+                bid=tick.bid,
+                ask=tick.ask,
+                last=tick.last,
+                volume=tick.volume,
+                spread=(tick.ask - tick.bid) * self.symbol_info.inv_point if self.symbol_info else 0,
+                time_msc=tick.time_msc,
+            )
             
             self.last_tick = tick_data
+            self._tick_cache_ts = now
             return tick_data
             
         except Exception as e:
@@ -229,24 +508,61 @@ class MT5Client:
             if info is None:
                 return None
             
-            return {
-                'balance': info.balance,
-                'equity': info.equity,
-                'margin': info.margin,
-                'free_margin': info.margin_free,
-                'margin_level': info.margin_level,
-                'profit': info.profit,
-                'currency': info.currency,
-                'leverage': info.leverage,
-                'limit_orders': info.limit_orders,
-            }
+            return self._account_to_dict(info)
             
         except Exception as e:
             logger.error(f"Error getting account info: {e}")
             return None
     
-    def get_positions(self, symbol: Optional[str] = None) -> List[Dict]:
-        """Get open positions"""
+    def snapshot(self, symbol: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get account info, open positions and pending orders in one call
+        
+        The three terminal queries are issued back to back so they describe the
+        same moment. Results are cached for `snapshot_ttl` seconds (config,
+        default 0.1) so repeated queries within one tick are free; any
+        successful trade request invalidates the cache.
+        
+        Returns dict with 'account' (None if unavailable), 'positions' and
+        'orders', or None when not connected
+        """
+        if not self.connected:
+            return None
+        
+        now = time.monotonic()
+        cached = self._snapshot_cache.get(symbol)
+        if cached is not None and now - cached[0] <= self.snapshot_ttl:
+            return cached[1]
+        
+        try:
+            info = mt5.account_info()
+            if symbol:
+                positions = mt5.positions_get(symbol=symbol)
+                orders = mt5.orders_get(symbol=symbol)
+            else:
+                positions = mt5.positions_get()
+                orders = mt5.orders_get()
+            
+            snapshot = {
+                'account': self._account_to_dict(info) if info is not None else None,
+                'positions': [self._position_to_dict(pos) for pos in positions or ()],
+                'orders': [self._order_to_dict(order) for order in orders or ()],
+            }
+            self._snapshot_cache[symbol] = (now, snapshot)
+            return snapshot
+            
+        except Exception as e:
+            logger.error(f"Error getting snapshot: {e}")
+            return None
+    
+    def get_positions(self, symbol: Optional[str] = None, magic: Optional[int] = None) -> List[Dict]:
+        """
+        Get open positions
+        
+        Args:
+            symbol: Only positions on this symbol
+            magic: Only positions with this magic number (filtered before dict conversion)
+        """
         if not self.connected:
             return []
         
@@ -259,12 +575,50 @@ class MT5Client:
             if positions is None:
                 return []
             
+            if magic is not None:
+                return [self._position_to_dict(pos) for pos in positions if pos.magic == magic]
+            
             return [self._position_to_dict(pos) for pos in positions]
             
         except Exception as e:
             logger.error(f"Error getting positions: {e}")
             return []
     
+    def count_positions(self, symbol: Optional[str] = None, magic: Optional[int] = None) -> int:
+        """Number of open positions, counted on the raw MT5 records without dict conversion"""
+        if not self.connected:
+            return 0
+        
+        try:
+            positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
+            if not positions:
+                return 0
+            
+            if magic is not None:
+                return sum(1 for pos in positions if pos.magic == magic)
+            
+            return len(positions)
+            
+        except Exception as e:
+            logger.error(f"Error counting positions: {e}")
+            return 0
+    
+    def has_position(self, symbol: Optional[str] = None, magic: Optional[int] = None) -> bool:
+        """Whether any matching position is open"""
+        if magic is None:
+            return self.count_positions(symbol) > 0
+        
+        if not self.connected:
+            return False
+        
+        try:
+            positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
+            return any(pos.magic == magic for pos in positions or ())
+            
+        except Exception as e:
+            logger.error(f"Error checking positions: {e}")
+            return False
+    
     def get_orders(self, symbol: Optional[str] = None) -> List[Dict]:
         """Get pending orders"""
         if not self.connected:
@@ -296,7 +650,7 @@ class MT5Client:
                 return False, {'error': 'Invalid order request'}
             
             # Send order
-            result = mt5.order_send(order_request)
+            result = _order_send(order_request)
             
             if result is None:
                 return False, {'error': 'Order send returned None'}
@@ -313,12 +667,13 @@ class MT5Client:
             }
             
             # Check result
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
+            if result.retcode != _TRADE_RETCODE_DONE:
                 error_msg = self._get_retcode_message(result.retcode)
                 logger.error(f"Order failed: {error_msg}")
                 result_dict['error'] = error_msg
                 return False, result_dict
             
+            self._snapshot_cache.clear()
             logger.info(f"Order placed successfully: {result.order}")
             return True, result_dict
             
@@ -342,7 +697,7 @@ class MT5Client:
             
             # Build modification request
             request = {
-                'action': mt5.TRADE_ACTION_MODIFY,
+                'action': _TRADE_ACTION_MODIFY,
                 'order': ticket,
                 'symbol': order.symbol,
                 'sl': sl if sl is not None else order.sl,
@@ -352,12 +707,13 @@ class MT5Client:
                 'expiration': order.expiration,
             }
             
-            result = mt5.order_send(request)
+            result = _order_send(request)
             
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
+            if result.retcode != _TRADE_RETCODE_DONE:
                 logger.error(f"Order modification failed: {self._get_retcode_message(result.retcode)}")
                 return False
             
+            self._snapshot_cache.clear()
             return True
             
         except Exception as e:
@@ -380,17 +736,18 @@ class MT5Client:
             
             # Build cancellation request
             request = {
-                'action': mt5.TRADE_ACTION_REMOVE,
+                'action': _TRADE_ACTION_REMOVE,
                 'order': ticket,
                 'symbol': order.symbol,
             }
             
-            result = mt5.order_send(request)
+            result = _order_send(request)
             
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
+            if result.retcode != _TRADE_RETCODE_DONE:
                 logger.error(f"Order cancellation failed: {self._get_retcode_message(result.retcode)}")
                 return False
             
+            self._snapshot_cache.clear()
             logger.info(f"Order {ticket} cancelled successfully")
             return True
             
@@ -398,6 +755,64 @@ class MT5Client:
             logger.error(f"Error cancelling order: {e}")
             return False
     
+    def cancel_orders_batch(self, tickets: List[int]) -> List[int]:
+        """
+        Cancel several pending orders
+        
+        The orders are looked up with one orders_get call instead of one per
+        ticket; MT5 has no multi-cancel, so each removal is still its own
+        order_send. Returns the tickets that are no longer pending (cancelled
+        now or already gone)
+        """
+        if not self.connected or not tickets:
+            return []
+        
+        try:
+            live_orders = mt5.orders_get()
+            if live_orders is None:
+                logger.error(f"Failed to get orders for batch cancel: {mt5.last_error()}")
+                return []
+            
+            wanted = set(tickets)
+            orders = {o.ticket: o for o in live_orders if o.ticket in wanted}
+        except Exception as e:
+            logger.error(f"Error getting orders for batch cancel: {e}")
+            return []
+        
+        cancelled = []
+        for ticket in tickets:
+            order = orders.get(ticket)
+            if order is None:
+                logger.warning(f"Order {ticket} not found")
+                cancelled.append(ticket)  # Consider already cancelled
+                continue
+            
+            try:
+                result = _order_send({
+                    'action': _TRADE_ACTION_REMOVE,
+                    'order': ticket,
+                    'symbol': order.symbol,
+                })
+            except Exception as e:
+                logger.error(f"Error cancelling order {ticket}: {e}")
+                continue
+            
+            # MT5 returns None on terminal/IPC failure; skip just this ticket
+            if result is None:
+                logger.error(f"Order {ticket} cancellation failed: order_send returned None ({mt5.last_error()})")
+                continue
+            
+            if result.retcode != _TRADE_RETCODE_DONE:
+                logger.error(f"Order {ticket} cancellation failed: {self._get_retcode_message(result.retcode)}")
+                continue
+            
+            logger.info(f"Order {ticket} cancelled successfully")
+            cancelled.append(ticket)
+        
+        if cancelled:
+            self._snapshot_cache.clear()
+        return cancelled
+    
     def close_position(self, ticket: int) -> bool:
         """Close an open position"""
         if not self.connected:
@@ -413,25 +828,24 @@ class MT5Client:
             position = positions[0]
             
             # Determine close type (opposite of position type)
-            close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
+            close_type = _CLOSE_ORDER_TYPE[position.type]
             
             # Build close request
             request = {
-                'action': mt5.TRADE_ACTION_DEAL,
+                **self._close_template,
                 'symbol': position.symbol,
                 'volume': position.volume,
                 'type': close_type,
                 'position': ticket,
-                'magic': self.config.get('magic', 0),
-                'comment': 'Close by bot',
             }
             
-            result = mt5.order_send(request)
+            result = _order_send(request)
             
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
+            if result.retcode != _TRADE_RETCODE_DONE:
                 logger.error(f"Position close failed: {self._get_retcode_message(result.retcode)}")
                 return False
             
+            self._snapshot_cache.clear()
             logger.info(f"Position {ticket} closed successfully")
             return True
             
@@ -445,6 +859,16 @@ class MT5Client:
             logger.error("Maximum reconnection attempts reached")
             return False
         
+        # Keep the terminal session (and its broker login) if it is still
+        # healthy; shutdown + initialize + login is the expensive path
+        if self._is_session_alive():
+            self.connected = True
+            self.connection_attempts = 0
+            if not self.symbol_info:
+                self._update_symbol_info()
+            logger.info("MT5 session still alive, reconnection not needed")
+            return True
+        
         self.connection_attempts += 1
         logger.info(f"Attempting reconnection {self.connection_attempts}/{self.max_reconnect_attempts}")
         
@@ -463,9 +887,25 @@ class MT5Client:
         
         return False
     
+    def submit(self, method, *args, **kwargs) -> Future:
+        """
+        Run a client method on the dedicated MT5 worker thread
+        
+        Lets the caller do Python work while the terminal round-trip is in
+        flight. The caller must not make other MT5 calls until every future
+        it submitted has resolved, otherwise two threads would use the API
+        at once.
+        """
+        return self._executor.submit(method, *args, **kwargs)
+    
+    def get_bars_async(self, timeframe: str, count: int) -> Future:
+        """Background get_bars; resolves to the DataFrame or None"""
+        return self.submit(self.get_bars, timeframe, count)
+    
     def shutdown(self):
         """Shutdown MT5 connection"""
         try:
+            self._executor.shutdown(wait=True)
             mt5.shutdown()
             self.connected = False
             logger.info("MT5 connection closed")
@@ -481,11 +921,13 @@ class MT5Client:
                 return False
         
         # Validate volume
-        if self.symbol_info:
+        symbol_info = self.symbol_info
+        if symbol_info:
             volume = request['volume']
-            min_lot = self.symbol_info['min_lot']
-            max_lot = self.symbol_info['max_lot']
-            lot_step = self.symbol_info['lot_step']
+            min_lot = symbol_info.min_lot
+            max_lot = symbol_info.max_lot
+            lot_step = symbol_info.lot_step
+            inv_lot_step = symbol_info.inv_lot_step
             
             if volume < min_lot or volume > max_lot:
                 #logger.error(f"Volume {volume} outside valid range [{min_lot}, {max_lot}]")
@@ -493,16 +935,31 @@ class MT5Client:
                 logger.info(f"Got volume {volume} placing with 0.01")
                 volume = 0.01
             # Round to lot step
-            request['volume'] = round(volume / lot_step) * lot_step
+            if inv_lot_step:
+                request['volume'] = round(volume * inv_lot_step) * lot_step
         
         return True
     
+    def _account_to_dict(self, info) -> Dict:
+        """Convert MT5 account info to dictionary"""
+        return {
+            'balance': info.balance,
+            'equity': info.equity,
+            'margin': info.margin,
+            'free_margin': info.margin_free,
+            'margin_level': info.margin_level,
+            'profit': info.profit,
+            'currency': info.currency,
+            'leverage': info.leverage,
+            'limit_orders': info.limit_orders,
+        }
+    
     def _position_to_dict(self, position) -> Dict:
         """Convert MT5 position to dictionary"""
         return {
             'ticket': position.ticket,
             'symbol': position.symbol,
-            'type': 'BUY' if position.type == mt5.ORDER_TYPE_BUY else 'SELL',
+            'type': 'BUY' if position.type == _ORDER_TYPE_BUY else 'SELL',
             'volume': position.volume,
             'price_open': position.price_open,
             'price': position.price_open,  # Keep for backward compatibility
@@ -514,7 +971,7 @@ class MT5Client:
             #'commission': position.commission,
             'magic': position.magic,
             'comment': position.comment,
-            'time': datetime.fromtimestamp(position.time, tz=timezone.utc),
+            'time': _utc_from_timestamp(position.time),
         }
     
     def _order_to_dict(self, order) -> Dict:
@@ -529,44 +986,14 @@ class MT5Client:
             'tp': order.tp,
             'magic': order.magic,
             'comment': order.comment,
-            'time_setup': datetime.fromtimestamp(order.time_setup, tz=timezone.utc),
-            'time_expiration': datetime.fromtimestamp(order.time_expiration, tz=timezone.utc) if order.time_expiration else None,
+            'time_setup': _utc_from_timestamp(order.time_setup),
+            'time_expiration': _utc_from_timestamp(order.time_expiration) if order.time_expiration else None,
         }
     
     def _get_order_type_name(self, order_type: int) -> str:
         """Convert MT5 order type to string"""
-        type_map = {
-            mt5.ORDER_TYPE_BUY: 'BUY',
-            mt5.ORDER_TYPE_SELL: 'SELL',
-            mt5.ORDER_TYPE_BUY_LIMIT: 'BUY_LIMIT',
-            mt5.ORDER_TYPE_SELL_LIMIT: 'SELL_LIMIT',
-            mt5.ORDER_TYPE_BUY_STOP: 'BUY_STOP',
-            mt5.ORDER_TYPE_SELL_STOP: 'SELL_STOP',
-        }
-        return type_map.get(order_type, 'UNKNOWN')
+        return _ORDER_TYPE_NAMES.get(order_type, 'UNKNOWN')
     
     def _get_retcode_message(self, retcode: int) -> str:
         """Get human-readable message for MT5 return code"""
-        messages = {
-            mt5.TRADE_RETCODE_REQUOTE: "Requote",
-            mt5.TRADE_RETCODE_REJECT: "Request rejected",
-            mt5.TRADE_RETCODE_CANCEL: "Request cancelled",
-            mt5.TRADE_RETCODE_PLACED: "Order placed",
-            mt5.TRADE_RETCODE_DONE: "Request completed",
-            mt5.TRADE_RETCODE_DONE_PARTIAL: "Request partially completed",
-            mt5.TRADE_RETCODE_ERROR: "Request processing error",
-            mt5.TRADE_RETCODE_TIMEOUT: "Request timeout",
-            mt5.TRADE_RETCODE_INVALID: "Invalid request",
-            mt5.TRADE_RETCODE_INVALID_VOLUME: "Invalid volume",
-            mt5.TRADE_RETCODE_INVALID_PRICE: "Invalid price",
-            mt5.TRADE_RETCODE_INVALID_STOPS: "Invalid stops",
-            mt5.TRADE_RETCODE_TRADE_DISABLED: "Trade disabled",
-            mt5.TRADE_RETCODE_MARKET_CLOSED: "Market closed",
-            mt5.TRADE_RETCODE_NO_MONEY: "Not enough money",
-            mt5.TRADE_RETCODE_PRICE_CHANGED: "Price changed",
-            mt5.TRADE_RETCODE_PRICE_OFF: "No quotes",
-            mt5.TRADE_RETCODE_INVALID_EXPIRATION: "Invalid expiration",
-            mt5.TRADE_RETCODE_ORDER_CHANGED: "Order state changed",
-            mt5.TRADE_RETCODE_TOO_MANY_REQUESTS: "Too many requests",
-        }
-        return messages.get(retcode, f"Unknown error ({retcode})")
+        return _RETCODE_MESSAGES.get(retcode, f"Unknown error ({retcode})")
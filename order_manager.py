@@ -8,9 +8,68 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 import json
+from collections import OrderedDict
+from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Most recent action ids kept for the idempotency check. Evicted ids are not
+# looked up in persistence: action ids hash the signal's microsecond timestamp
+# (SignalEngine._generate_action_id), so an id older than the newest
+# MAX_EXECUTED_ACTIONS cannot be generated again, before or after a restart
+MAX_EXECUTED_ACTIONS = 10000
+
+_REQUIRED_SIGNAL_FIELDS = frozenset(('symbol', 'side', 'entry_price', 'sl_price', 'tp_price'))
+_SIDES = frozenset(('BUY', 'SELL'))
+
+# Pending order type by (side, sign of entry - current price): entries
+# better than the market are limits, anything else (including equal) stops
+_PENDING_ORDER_TYPE = {
+    ('BUY', -1): mt5.ORDER_TYPE_BUY_LIMIT,
+    ('BUY', 0): mt5.ORDER_TYPE_BUY_STOP,
+    ('BUY', 1): mt5.ORDER_TYPE_BUY_STOP,
+    ('SELL', 1): mt5.ORDER_TYPE_SELL_LIMIT,
+    ('SELL', 0): mt5.ORDER_TYPE_SELL_STOP,
+    ('SELL', -1): mt5.ORDER_TYPE_SELL_STOP,
+}
+
+
+@dataclass(slots=True)
+class PendingOrder:
+    """Pending order placed by the bot, tracked until filled, cancelled or expired"""
+    signal: Dict
+    placed_time: datetime
+    expiry_time: datetime
+
+
+class OrderManagerError(Exception):
+    """A signal was rejected before its order reached MT5; str() is the reason"""
+    log_level = logging.WARNING
+
+
+class DuplicateSignal(OrderManagerError):
+    """The signal's action was already executed"""
+    log_level = logging.INFO
+
+
+class InvalidSignal(OrderManagerError):
+    """The signal is missing fields or carries invalid values"""
+    log_level = logging.ERROR
+
+
+class RiskRejected(OrderManagerError):
+    """The risk manager refused the signal"""
+
+
+class ConflictingOrders(OrderManagerError):
+    """Existing orders/positions block the signal"""
+    log_level = logging.INFO
+
+
+class MT5Error(OrderManagerError):
+    """Market data needed to build the order was unavailable"""
+    log_level = logging.ERROR
+
 
 class OrderManager:
     """
@@ -22,8 +81,25 @@ class OrderManager:
         self.mt5_client = mt5_client
         self.risk_manager = risk_manager
         self.persistence = persistence
-        self.pending_orders = {}
-        self.executed_actions = set()
+        self.pending_orders: Dict[int, PendingOrder] = {}
+        self.executed_actions: OrderedDict = OrderedDict()  # action_id -> None, oldest first
+        
+        # Config scalars read on every signal/status call
+        self._symbol = config['symbol']
+        self._magic = int(config.get('magic', 0))
+        self._max_pending = config.get('max_pending', 2)
+        self._max_concurrent = config.get('max_concurrent_trades', 3)
+        self._pending_expiry = timedelta(minutes=config.get('pending_expiry_min', 20))
+        self._max_spread = config.get('max_spread', 8.0)
+        
+        # Constant part of every pending-order request; _build_order_request
+        # adds the signal-specific fields
+        self._order_template = {
+            'action': mt5.TRADE_ACTION_PENDING,
+            'deviation': 10,  # Max deviation in points
+            'magic': self._magic,
+            'type_time': mt5.ORDER_TIME_SPECIFIED,
+        }
         
     def process_signal(self, signal: Dict) -> Tuple[bool, Dict]:
         """
@@ -33,18 +109,15 @@ class OrderManager:
             # Check idempotency
             action_id = signal.get('action_id')
             if action_id in self.executed_actions:
-                logger.info(f"Action {action_id} already executed, skipping")
-                return False, {'error': 'Duplicate action'}
+                raise DuplicateSignal(f"Action {action_id} already executed, skipping")
             
             # Validate signal
-            if not self._validate_signal(signal):
-                return False, {'error': 'Invalid signal'}
+            self._validate_signal(signal)
             
             # Check risk limits
             risk_check = self.risk_manager.check_signal(signal)
             if not risk_check['allowed']:
-                logger.warning(f"Risk check failed: {risk_check['reason']}")
-                return False, risk_check
+                raise RiskRejected(f"Risk check failed: {risk_check['reason']}")
             
             # Calculate lot size
             lot_size = self.risk_manager.calculate_lot_size(signal)
@@ -55,13 +128,13 @@ class OrderManager:
             signal['lot_size'] = lot_size
             
             # Check existing orders
-            if not self._check_existing_orders(signal):
-                return False, {'error': 'Conflicting orders exist'}
+            self._check_existing_orders(signal)
+            
+            # One clock read for the broker expiration and the local tracking
+            now = datetime.now(timezone.utc)
             
             # Build order request
-            order_request = self._build_order_request(signal)
-            if not order_request:
-                return False, {'error': 'Failed to build order request'}
+            order_request = self._build_order_request(signal, now)
             
             # Persist signal before execution
             self.persistence.save_signal(signal, status='PENDING')
@@ -76,16 +149,16 @@ class OrderManager:
                 self.persistence.update_signal(signal['action_id'], status='PLACED', mt5_order_id=result.get('order'))
                 
                 # Track pending order
-                self.pending_orders[result['order']] = {
-                    'signal': signal,
-                    'placed_time': datetime.now(timezone.utc),
-                    'expiry_time': datetime.now(timezone.utc) + timedelta(minutes=self.config.get('pending_expiry_min', 20)),
-                }
+                self.pending_orders[result['order']] = PendingOrder(
+                    signal=signal,
+                    placed_time=now,
+                    expiry_time=now + self._pending_expiry,
+                )
                 
                 # Mark action as executed
-                self.executed_actions.add(action_id)
+                self._mark_executed(action_id)
                 
-                logger.info(f"Order placed successfully: {result['order']}")
+                logger.info("Order placed successfully: %s", result['order'])
                 return True, result
             else:
                 self.persistence.update_signal(signal['action_id'], status='FAILED', error=result.get('error'))
@@ -95,125 +168,112 @@ class OrderManager:
                 
                 return False, result
             
+        except OrderManagerError as e:
+            logger.log(e.log_level, str(e))
+            return False, {'error': str(e)}
         except Exception as e:
             logger.error(f"Error processing signal: {e}")
             return False, {'error': str(e)}
     
-    def _validate_signal(self, signal: Dict) -> bool:
+    def _mark_executed(self, action_id: str):
+        """Record an executed action id, evicting the oldest past MAX_EXECUTED_ACTIONS"""
+        executed = self.executed_actions
+        executed[action_id] = None
+        executed.move_to_end(action_id)
+        if len(executed) > MAX_EXECUTED_ACTIONS:
+            evicted, _ = executed.popitem(last=False)
+            logger.debug("Evicted executed action %s from the duplicate guard", evicted)
+    
+    def _validate_signal(self, signal: Dict):
         """
         Validate signal has all required fields
+        Raises InvalidSignal
         """
-        required_fields = ['symbol', 'side', 'entry_price', 'sl_price', 'tp_price']
-        
-        for field in required_fields:
-            if field not in signal:
-                logger.error(f"Signal missing required field: {field}")
-                return False
+        missing = _REQUIRED_SIGNAL_FIELDS - signal.keys()
+        if missing:
+            raise InvalidSignal(f"Signal missing required fields: {', '.join(sorted(missing))}")
         
         # Validate prices are positive
-        if signal['entry_price'] <= 0 or signal['sl_price'] <= 0 or signal['tp_price'] <= 0:
-            logger.error("Invalid price values in signal")
-            return False
+        if min(signal['entry_price'], signal['sl_price'], signal['tp_price']) <= 0:
+            raise InvalidSignal("Invalid price values in signal")
         
         # Validate side
-        if signal['side'] not in ['BUY', 'SELL']:
-            logger.error(f"Invalid side: {signal['side']}")
-            return False
-        
-        return True
+        if signal['side'] not in _SIDES:
+            raise InvalidSignal(f"Invalid side: {signal['side']}")
     
-    def _check_existing_orders(self, signal: Dict) -> bool:
+    def _check_existing_orders(self, signal: Dict):
         """
         Check for conflicting existing orders
+        Raises ConflictingOrders
         """
-        try:
-            # Get existing orders for symbol
-            orders = self.mt5_client.get_orders(symbol=signal['symbol'])
-            positions = self.mt5_client.get_positions(symbol=signal['symbol'])
-            
-            # Count pending orders
-            pending_count = len([o for o in orders if o.get('magic') == self.config.get('magic', 0)])
-            max_pending = self.config.get('max_pending', 2)
-            
-            if pending_count >= max_pending:
-                logger.info(f"Maximum pending orders reached: {pending_count} >= {max_pending}")
-                return False
-            
-            # Count open positions
-            position_count = len([p for p in positions if p.get('magic') == self.config.get('magic', 0)])
-            max_concurrent = self.config.get('max_concurrent_trades', 3)
-            
-            if position_count >= max_concurrent:
-                logger.info(f"Maximum concurrent trades reached: {position_count} >= {max_concurrent}")
-                return False
-            
-            # Check for duplicate pending orders at similar price
-            for order in orders:
-                if order.get('magic') == self.config.get('magic', 0):
-                    price_diff = abs(order['price'] - signal['entry_price'])
-                    
-                    # If order at very similar price exists, skip
-                    if price_diff < signal.get('atr', 10) * 0.2:
-                        logger.info(f"Similar pending order exists at {order['price']:.5f}")
-                        return False
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error checking existing orders: {e}")
-            return False
+        # Get existing orders and positions for symbol in one snapshot
+        snapshot = self.mt5_client.snapshot(symbol=signal['symbol']) or {}
+        orders = snapshot.get('orders', [])
+        positions = snapshot.get('positions', [])
+        
+        # One pass over the orders: our order prices give both the
+        # pending count and the duplicate check below
+        magic = self._magic
+        my_order_prices = [o['price'] for o in orders if o.get('magic') == magic]
+        pending_count = len(my_order_prices)
+        max_pending = self._max_pending
+        
+        if pending_count >= max_pending:
+            raise ConflictingOrders(f"Maximum pending orders reached: {pending_count} >= {max_pending}")
+        
+        # Count open positions
+        position_count = sum(1 for p in positions if p.get('magic') == magic)
+        max_concurrent = self._max_concurrent
+        
+        if position_count >= max_concurrent:
+            raise ConflictingOrders(f"Maximum concurrent trades reached: {position_count} >= {max_concurrent}")
+        
+        # Check for duplicate pending orders at similar price
+        entry_price = signal['entry_price']
+        threshold = signal.get('atr', 10) * 0.2
+        for price in my_order_prices:
+            # If order at very similar price exists, skip
+            if abs(price - entry_price) < threshold:
+                raise ConflictingOrders(f"Similar pending order exists at {price:.5f}")
     
-    def _build_order_request(self, signal: Dict) -> Optional[Dict]:
+    def _build_order_request(self, signal: Dict, now: Optional[datetime] = None) -> Dict:
         """
         Build MT5 order request from signal
+        The order expires pending_expiry_min after `now` (default: current UTC time)
+        Raises MT5Error when no tick is available
         """
-        try:
-            # Determine order type based on side and current price
-            tick = self.mt5_client.get_tick()
-            if not tick:
-                return None
-            
-            current_price = tick['ask'] if signal['side'] == 'BUY' else tick['bid']
-            
-            # Determine if limit or stop order
-            if signal['side'] == 'BUY':
-                if signal['entry_price'] < current_price:
-                    order_type = mt5.ORDER_TYPE_BUY_LIMIT
-                else:
-                    order_type = mt5.ORDER_TYPE_BUY_STOP
-            else:
-                if signal['entry_price'] > current_price:
-                    order_type = mt5.ORDER_TYPE_SELL_LIMIT
-                else:
-                    order_type = mt5.ORDER_TYPE_SELL_STOP
-            
-            # Calculate expiration time
-            expiry_minutes = self.config.get('pending_expiry_min', 20)
-            expiration = datetime.now(timezone.utc) + timedelta(minutes=expiry_minutes)
-            expiration_timestamp = int(expiration.timestamp())
-            
-            # Build request
-            request = {
-                'action': mt5.TRADE_ACTION_PENDING,
-                'symbol': signal['symbol'],
-                'volume': signal['lot_size'],
-                'type': order_type,
-                'price': signal['entry_price'],
-                'sl': signal['sl_price'],
-                'tp': signal['tp_price'],
-                'deviation': 10,  # Max deviation in points
-                'magic': self.config.get('magic', 0),
-                'comment': f"ICT_{signal.get('zone_type', 'NA')}_{signal.get('action_id', '')[:8]}",
-                'type_time': mt5.ORDER_TIME_SPECIFIED,
-                'expiration': expiration_timestamp,
-            }
-            
-            logger.debug(f"Built order request: {request}")
-            return request
-            
-        except Exception as e:
-            logger.error(f"Error building order request: {e}")
-            return None
+        # Determine order type based on side and current price
+        tick = self.mt5_client.get_tick()
+        if not tick:
+            raise MT5Error("No tick available to build order request")
+        
+        side = signal['side']
+        entry_price = signal['entry_price']
+        current_price = tick.ask if side == 'BUY' else tick.bid
+        
+        # Determine if limit or stop order
+        order_type = _PENDING_ORDER_TYPE[(side, (entry_price > current_price) - (entry_price < current_price))]
+        
+        # Calculate expiration time
+        if now is None:
+            now = datetime.now(timezone.utc)
+        expiration_timestamp = int((now + self._pending_expiry).timestamp())
+        
+        # Build request
+        request = {
+            **self._order_template,
+            'symbol': signal['symbol'],
+            'volume': signal['lot_size'],
+            'type': order_type,
+            'price': entry_price,
+            'sl': signal['sl_price'],
+            'tp': signal['tp_price'],
+            'comment': f"ICT_{signal.get('zone_type', 'NA')}_{signal.get('action_id', '')[:8]}",
+            'expiration': expiration_timestamp,
+        }
+        
+        logger.debug("Built order request: %s", request)
+        return request
     
     def _handle_order_error(self, result: Dict, signal: Dict):
         """
@@ -247,64 +307,68 @@ class OrderManager:
             orders_to_cancel = []
             
             # Get current orders from broker
-            broker_orders = self.mt5_client.get_orders(symbol=self.config['symbol'])
-            broker_order_ids = {order['ticket'] for order in broker_orders}
-            
-            # Check tracked pending orders
-            for order_id, order_data in list(self.pending_orders.items()):
-                # Check if order still exists at broker
-                if order_id not in broker_order_ids:
-                    # Order filled or cancelled externally
-                    logger.info(f"Order {order_id} no longer pending")
-                    del self.pending_orders[order_id]
-                    continue
-                
+            broker_orders = self.mt5_client.get_orders(symbol=self._symbol)
+            broker_order_ids = frozenset(order['ticket'] for order in broker_orders)
+            
+            # Tracked orders gone from the broker were filled or cancelled externally
+            for order_id in self.pending_orders.keys() - broker_order_ids:
+                logger.info("Order %s no longer pending", order_id)
+                self.pending_orders.pop(order_id, None)
+            
+            # One tick for every validity check below (fetched on first use)
+            tick = None
+            
+            # Check tracked pending orders still at the broker; nothing is
+            # removed until the cancel sweep, so iterate the live dict
+            for order_id, order_data in self.pending_orders.items():
                 # Check expiry
-                if current_time > order_data['expiry_time']:
-                    logger.info(f"Order {order_id} expired")
+                if current_time > order_data.expiry_time:
+                    logger.info("Order %s expired", order_id)
                     orders_to_cancel.append(order_id)
                     continue
                 
                 # Check if signal conditions still valid
-                signal = order_data['signal']
-                if not self._is_signal_still_valid(signal):
-                    logger.info(f"Signal conditions for order {order_id} no longer valid")
+                signal = order_data.signal
+                if tick is None:
+                    tick = self.mt5_client.get_tick()
+                if not self._is_signal_still_valid(signal, tick):
+                    logger.info("Signal conditions for order %s no longer valid", order_id)
                     orders_to_cancel.append(order_id)
             
-            # Cancel invalid orders
-            for order_id in orders_to_cancel:
-                if self.mt5_client.cancel_order(order_id):
-                    if order_id in self.pending_orders:
-                        signal = self.pending_orders[order_id]['signal']
-                        self.persistence.update_signal(signal['action_id'], status='CANCELLED')
-                        del self.pending_orders[order_id]
+            # Cancel invalid orders and drop them from tracking in one sweep
+            for order_id in self.mt5_client.cancel_orders_batch(orders_to_cancel):
+                order_data = self.pending_orders.pop(order_id, None)
+                if order_data is not None:
+                    self.persistence.update_signal(order_data.signal['action_id'], status='CANCELLED')
             
         except Exception as e:
             logger.error(f"Error managing pending orders: {e}")
     
-    def _is_signal_still_valid(self, signal: Dict) -> bool:
+    def _is_signal_still_valid(self, signal: Dict, tick=None) -> bool:
         """
-        Check if signal conditions are still valid
+        Check if signal conditions are still valid against `tick`
+        (fetched here when not given)
         """
         try:
             # Get current market data
-            tick = self.mt5_client.get_tick()
+            if tick is None:
+                tick = self.mt5_client.get_tick()
             if not tick:
                 return True  # Assume valid if can't check
             
-            current_price = tick['ask'] if signal['side'] == 'BUY' else tick['bid']
+            current_price = tick.ask if signal['side'] == 'BUY' else tick.bid
             
             # Check if price has moved too far from entry
             max_distance = signal.get('atr', 10) * 3  # 3 ATRs away
             distance = abs(current_price - signal['entry_price'])
             
             if distance > max_distance:
-                logger.info(f"Price moved too far from entry: {distance:.5f} > {max_distance:.5f}")
+                logger.info("Price moved too far from entry: %.5f > %.5f", distance, max_distance)
                 return False
             
             # Check if spread is still acceptable
-            if tick['spread'] > self.config.get('max_spread', 8.0) * 1.5:
-                logger.info(f"Spread too high: {tick['spread']}")
+            if tick.spread > self._max_spread * 1.5:
+                logger.info("Spread too high: %s", tick.spread)
                 return False
             
             return True
@@ -318,11 +382,11 @@ class OrderManager:
         Emergency close all positions
         """
         try:
-            positions = self.mt5_client.get_positions(symbol=self.config['symbol'])
+            positions = self.mt5_client.get_positions(symbol=self._symbol)
             
             for position in positions:
-                if position.get('magic') == self.config.get('magic', 0):
-                    logger.info(f"Closing position {position['ticket']}: {reason}")
+                if position.get('magic') == self._magic:
+                    logger.info("Closing position %s: %s", position['ticket'], reason)
                     self.mt5_client.close_position(position['ticket'])
             
         except Exception as e:
@@ -333,12 +397,15 @@ class OrderManager:
         Cancel all pending orders
         """
         try:
-            orders = self.mt5_client.get_orders(symbol=self.config['symbol'])
+            orders = self.mt5_client.get_orders(symbol=self._symbol)
             
+            tickets = []
             for order in orders:
-                if order.get('magic') == self.config.get('magic', 0):
-                    logger.info(f"Cancelling order {order['ticket']}: {reason}")
-                    self.mt5_client.cancel_order(order['ticket'])
+                if order.get('magic') == self._magic:
+                    logger.info("Cancelling order %s: %s", order['ticket'], reason)
+                    tickets.append(order['ticket'])
+            
+            self.mt5_client.cancel_orders_batch(tickets)
             
             # Clear tracking
             self.pending_orders.clear()
@@ -351,20 +418,26 @@ class OrderManager:
         Get current order manager status
         """
         try:
-            positions = self.mt5_client.get_positions(symbol=self.config['symbol'])
-            orders = self.mt5_client.get_orders(symbol=self.config['symbol'])
-            
-            # Filter by magic number
-            my_positions = [p for p in positions if p.get('magic') == self.config.get('magic', 0)]
-            my_orders = [o for o in orders if o.get('magic') == self.config.get('magic', 0)]
-            
-            # Calculate total exposure
-            total_volume = sum(p['volume'] for p in my_positions)
-            total_profit = sum(p.get('profit', 0) for p in my_positions)
+            snapshot = self.mt5_client.snapshot(symbol=self._symbol) or {}
+            positions = snapshot.get('positions', [])
+            orders = snapshot.get('orders', [])
+            
+            # Count our positions and total their exposure in one pass
+            magic = self._magic
+            position_count = 0
+            total_volume = 0
+            total_profit = 0
+            for p in positions:
+                if p.get('magic') == magic:
+                    position_count += 1
+                    total_volume += p['volume']
+                    total_profit += p.get('profit', 0)
+            
+            order_count = sum(1 for o in orders if o.get('magic') == magic)
             
             return {
-                'open_positions': len(my_positions),
-                'pending_orders': len(my_orders),
+                'open_positions': position_count,
+                'pending_orders': order_count,
                 'tracked_pending': len(self.pending_orders),
                 'total_volume': total_volume,
                 'total_profit': total_profit,
@@ -4,7 +4,12 @@ Handles data storage in SQLite and CSV formats
 """
 
 import sqlite3
+import threading
+import atexit
+from itertools import groupby
+from functools import lru_cache
 import pandas as pd
+import numpy as np
 import json
 import csv
 from datetime import datetime, timezone
@@ -15,6 +20,107 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """Encode the values the json encoders don't handle natively"""
+    if isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+# C JSON encoder for zone_data/reason_tags/metadata when available; it handles
+# numpy scalars and arrays natively; the stdlib fallback writes the same compact
+# text for plain values
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=_json_default, separators=(',', ':'))
+    
+    _loads = json.loads
+
+# Statements are module constants so every call hands sqlite the same string
+# and hits its statement cache. Re-saving an action_id updates the signal row
+# in place (INSERT OR REPLACE would delete it and insert it under a new id)
+_SIGNAL_INSERT_SQL = '''
+    INSERT INTO signals (
+        timestamp_utc, action_id, strategy, symbol, side,
+        entry_price, sl_price, tp_price, atr, lots,
+        balance_at_signal, htf_trend, mtf_trend, zone_type,
+        zone_data, reason_tags, signal_score, rr_ratio,
+        status, mt5_order_id, mt5_retcode
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(action_id) DO UPDATE SET
+        timestamp_utc = excluded.timestamp_utc,
+        strategy = excluded.strategy,
+        symbol = excluded.symbol,
+        side = excluded.side,
+        entry_price = excluded.entry_price,
+        sl_price = excluded.sl_price,
+        tp_price = excluded.tp_price,
+        atr = excluded.atr,
+        lots = excluded.lots,
+        balance_at_signal = excluded.balance_at_signal,
+        htf_trend = excluded.htf_trend,
+        mtf_trend = excluded.mtf_trend,
+        zone_type = excluded.zone_type,
+        zone_data = excluded.zone_data,
+        reason_tags = excluded.reason_tags,
+        signal_score = excluded.signal_score,
+        rr_ratio = excluded.rr_ratio,
+        status = excluded.status,
+        mt5_order_id = excluded.mt5_order_id,
+        mt5_retcode = excluded.mt5_retcode
+'''
+
+_TRADE_INSERT_SQL = '''
+    INSERT INTO trades (
+        timestamp_open, timestamp_close, action_id, symbol, side,
+        volume, entry_price, exit_price, sl_price, tp_price,
+        profit, commission, swap, mt5_ticket, mt5_magic,
+        duration_seconds, max_profit, max_loss
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_METRIC_INSERT_SQL = '''
+    INSERT INTO metrics (timestamp_utc, metric_type, metric_name, metric_value, metadata)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+# Fixed CSV columns so every row lines up with the header; other keys are dropped
+SIGNAL_FIELDS = (
+    'timestamp', 'action_id', 'symbol', 'side', 'entry_price', 'sl_price',
+    'tp_price', 'atr', 'lot_size', 'htf_trend', 'mtf_trend', 'zone_type',
+    'zone_data', 'reason_tags', 'signal_score', 'rr_ratio', 'current_price',
+    'distance_to_entry', 'in_killzone', 'killzone', 'status'
+)
+
+TRADE_FIELDS = (
+    'timestamp', 'timestamp_open', 'timestamp_close', 'action_id', 'symbol',
+    'side', 'volume', 'entry_price', 'exit_price', 'sl_price', 'tp_price',
+    'profit', 'commission', 'swap', 'mt5_ticket', 'mt5_magic',
+    'duration_seconds', 'max_profit', 'max_loss'
+)
+
+CSV_BUFFER_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=64)
+def _update_signal_sql(columns: tuple) -> str:
+    """UPDATE statement for a given tuple of signal columns"""
+    set_clause = ', '.join(f"{column} = ?" for column in columns)
+    return f"UPDATE signals SET {set_clause} WHERE action_id = ?"
+
+
 class Persistence:
     """
     Manages data persistence for signals, trades, and metrics
@@ -29,18 +135,162 @@ class Persistence:
         # Create data directory if it doesn't exist
         Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
         Path(self.signals_csv).parent.mkdir(parents=True, exist_ok=True)
+        Path(self.trades_csv).parent.mkdir(parents=True, exist_ok=True)
         
         # Initialize database
         self._init_database()
         
+        # One long-lived connection shared by every call (the writer thread
+        # commits while callers read), serialised by the lock
+        self._conn = self._connect()
+        self._lock = threading.Lock()
+        
+        # Writes are buffered as (sql, params) in call order and committed
+        # together by the writer thread every flush_ms or flush_rows rows;
+        # reads flush first so they always see earlier writes
+        self._write_buffer: List[tuple] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_interval = config['persistence'].get('flush_ms', 500) / 1000
+        self._flush_rows = config['persistence'].get('flush_rows', 100)
+        self._flush_event = threading.Event()
+        self._closing = False
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="persistence-writer", daemon=True
+        )
+        self._writer_thread.start()
+        
+        # CSV files stay open behind a 1 MiB buffer; rows reach disk when the
+        # buffer fills and on close(). In 'bulk' csv_mode the signals CSV is
+        # instead rewritten from the ledger after each flush
+        self._csv_lock = threading.Lock()
+        self._csv_bulk = config['persistence'].get('csv_mode') == 'bulk'
+        if self._csv_bulk:
+            self._signals_csv_f, self._signals_writer = None, None
+        else:
+            self._signals_csv_f, self._signals_writer = self._open_csv(self.signals_csv, SIGNAL_FIELDS)
+        self._trades_csv_f, self._trades_writer = self._open_csv(self.trades_csv, TRADE_FIELDS)
+        
+        atexit.register(self._flush)
+        atexit.register(self._flush_csv)
+        
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the ledger
+        journal_mode=WAL is persistent in the file (set in _init_database);
+        synchronous and the cache/mmap/temp settings are per connection, so
+        they are applied here
+        """
+        conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+        return conn
+    
+    def _open_csv(self, filename: str, fieldnames: tuple):
+        """
+        Open a CSV file for appending and write the header if it is new
+        A file with a different header is moved aside to *.legacy.csv first
+        """
+        path = Path(filename)
+        if path.exists() and path.stat().st_size > 0:
+            with open(path, newline='') as existing:
+                header = next(csv.reader(existing), [])
+            if tuple(header) != fieldnames:
+                legacy = path.with_suffix('.legacy.csv')
+                if legacy.exists():
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    legacy = path.with_suffix(f'.legacy_{timestamp}.csv')
+                path.rename(legacy)
+                logger.warning(f"{filename} has a different header, moved to {legacy}")
+        
+        f = open(filename, 'a', newline='', buffering=CSV_BUFFER_SIZE)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        
+        if f.tell() == 0:
+            writer.writeheader()
+        
+        return f, writer
+    
+    def _flush_csv(self):
+        """Push buffered CSV rows to disk"""
+        with self._csv_lock:
+            for f in (self._signals_csv_f, self._trades_csv_f):
+                if f is not None and not f.closed:
+                    f.flush()
+    
+    def _queue_write(self, sql: str, params):
+        """Buffer a write for the next flush"""
+        with self._buffer_lock:
+            self._write_buffer.append((sql, params))
+            full = len(self._write_buffer) >= self._flush_rows
+        if full:
+            self._flush_event.set()
+    
+    def _writer_loop(self):
+        """Flush buffered writes periodically until close()"""
+        while not self._closing:
+            self._flush_event.wait(self._flush_interval)
+            self._flush_event.clear()
+            self._flush()
+    
+    def _flush(self):
+        """
+        Commit every buffered write in one transaction
+        Consecutive writes with the same SQL go through one executemany
+        """
+        # Swap and commit under the connection lock so that concurrent
+        # flushers (writer thread, a reader) commit their batches in order
+        with self._lock:
+            with self._buffer_lock:
+                batch = self._write_buffer
+                self._write_buffer = []
+            
+            if not batch:
+                return
+            
+            self._commit_batch(batch)
+        
+        # Bulk CSV mode rewrites the signals export once per flush instead of
+        # appending every row
+        if self._csv_bulk and any(sql is _SIGNAL_INSERT_SQL or sql.startswith('UPDATE signals')
+                                  for sql, _ in batch):
+            self.export_signals_csv()
+    
+    def _commit_batch(self, batch: List[tuple]):
+        """
+        Write a batch in one transaction, falling back to one row at a time
+        The caller holds self._lock
+        """
+        try:
+            with self._conn:
+                for sql, group in groupby(batch, key=lambda write: write[0]):
+                    self._conn.executemany(sql, [params for _, params in group])
+            logger.debug(f"Flushed {len(batch)} buffered writes")
+            return
+        except Exception as e:
+            logger.error(f"Error flushing {len(batch)} buffered writes, retrying one by one: {e}")
+        
+        # One bad write must not take the rest of the batch down with it
+        for sql, params in batch:
+            try:
+                with self._conn:
+                    self._conn.execute(sql, params)
+            except Exception as e:
+                logger.error(f"Error writing {sql.split('(')[0].strip()}: {e}")
+    
     def _init_database(self):
         """
         Initialize SQLite database with required tables
         """
         try:
-            conn = sqlite3.connect(self.db_file)
+            conn = self._connect()
             cursor = conn.cursor()
             
+            # WAL: commits append to the log instead of rewriting pages, and
+            # with synchronous=NORMAL only checkpoints fsync
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Signals table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS signals (
@@ -113,6 +363,7 @@ class Persistence:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp_utc)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_signals_action_id ON signals(action_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp_open)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp_close ON trades(timestamp_close)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp_utc)')
             
             conn.commit()
@@ -123,98 +374,79 @@ class Persistence:
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
     
-
-    def _make_json_safe(self, obj):
-        if isinstance(obj, pd.Timestamp):
-            return obj.isoformat()
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if isinstance(obj, dict):
-            return {k: self._make_json_safe(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self._make_json_safe(v) for v in obj]
-        return obj
-
-
-
+    def _signal_row(self, signal: Dict, status: str) -> tuple:
+        """
+        Build the signals table row for a signal
+        """
+        return (
+            datetime.now(timezone.utc).isoformat(),
+            signal.get('action_id'),
+            'ICT_Scalper',
+            signal.get('symbol'),
+            signal.get('side'),
+            signal.get('entry_price'),
+            signal.get('sl_price'),
+            signal.get('tp_price'),
+            signal.get('atr'),
+            signal.get('lot_size'),
+            signal.get('balance'),
+            signal.get('htf_trend'),
+            signal.get('mtf_trend'),
+            signal.get('zone_type'),
+            _dumps(signal.get('zone_data') or {}),
+            _dumps(signal.get('reason_tags') or []),
+            signal.get('signal_score'),
+            signal.get('rr_ratio'),
+            status,
+            signal.get('mt5_order_id'),
+            signal.get('mt5_retcode')
+        )
+    
     def save_signal(self, signal: Dict, status: str = 'CREATED'):
         """
-        Save signal to database and CSV
+        Save signal to database (buffered) and CSV
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Prepare data
-            timestamp = signal.get('timestamp', datetime.now(timezone.utc))
-            
-            # Insert into database
-            cursor.execute('''
-                INSERT OR REPLACE INTO signals (
-                    timestamp_utc, action_id, strategy, symbol, side,
-                    entry_price, sl_price, tp_price, atr, lots,
-                    balance_at_signal, htf_trend, mtf_trend, zone_type,
-                    zone_data, reason_tags, signal_score, rr_ratio,
-                    status, mt5_order_id, mt5_retcode
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now(timezone.utc).isoformat(),
-                signal.get('action_id'),
-                'ICT_Scalper',
-                signal.get('symbol'),
-                signal.get('side'),
-                signal.get('entry_price'),
-                signal.get('sl_price'),
-                signal.get('tp_price'),
-                signal.get('atr'),
-                signal.get('lot_size'),
-                signal.get('balance'),
-                signal.get('htf_trend'),
-                signal.get('mtf_trend'),
-                signal.get('zone_type'),
-                json.dumps(self._make_json_safe(signal.get('zone_data', {}))),
-                json.dumps(self._make_json_safe(signal.get('reason_tags', []))),
-                signal.get('signal_score'),
-                signal.get('rr_ratio'),
-                status,
-                signal.get('mt5_order_id'),
-                signal.get('mt5_retcode')
-            ))
-            
-            conn.commit()
-            conn.close()
+            self._queue_write(_SIGNAL_INSERT_SQL, self._signal_row(signal, status))
             
             # Also save to CSV for easy analysis
-            self._append_to_csv(self.signals_csv, signal, status)
+            if self._signals_writer is not None:
+                self._append_to_csv(self._signals_writer, signal, status)
             
             logger.debug(f"Signal saved: {signal.get('action_id')}")
             
         except Exception as e:
             logger.error(f"Error saving signal: {e}")
     
-    def update_signal(self, action_id: str, **kwargs):
+    def save_signals_batch(self, signals: List[tuple]):
         """
-        Update signal status and fields
+        Save many (signal, status) pairs; they are committed in one flush
         """
+        if not signals:
+            return
+        
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            for signal, status in signals:
+                self._queue_write(_SIGNAL_INSERT_SQL, self._signal_row(signal, status))
             
-            # Build update query dynamically
-            set_clause = []
-            values = []
-            
-            for key, value in kwargs.items():
-                set_clause.append(f"{key} = ?")
-                values.append(value)
-            
-            values.append(action_id)
+            # Also save to CSV for easy analysis
+            if self._signals_writer is not None:
+                for signal, status in signals:
+                    self._append_to_csv(self._signals_writer, signal, status)
             
-            query = f"UPDATE signals SET {', '.join(set_clause)} WHERE action_id = ?"
-            cursor.execute(query, values)
+            logger.debug(f"Saved batch of {len(signals)} signals")
             
-            conn.commit()
-            conn.close()
+        except Exception as e:
+            logger.error(f"Error saving signal batch: {e}")
+    
+    def update_signal(self, action_id: str, **kwargs):
+        """
+        Update signal status and fields (buffered behind earlier writes)
+        """
+        try:
+            # Same columns give the same cached SQL string
+            query = _update_signal_sql(tuple(kwargs))
+            self._queue_write(query, (*kwargs.values(), action_id))
             
             logger.debug(f"Signal updated: {action_id}")
             
@@ -223,20 +455,10 @@ class Persistence:
     
     def save_trade(self, trade: Dict):
         """
-        Save completed trade to database
+        Save completed trade to database (buffered)
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO trades (
-                    timestamp_open, timestamp_close, action_id, symbol, side,
-                    volume, entry_price, exit_price, sl_price, tp_price,
-                    profit, commission, swap, mt5_ticket, mt5_magic,
-                    duration_seconds, max_profit, max_loss
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            self._queue_write(_TRADE_INSERT_SQL, (
                 trade.get('timestamp_open'),
                 trade.get('timestamp_close'),
                 trade.get('action_id'),
@@ -257,11 +479,8 @@ class Persistence:
                 trade.get('max_loss')
             ))
             
-            conn.commit()
-            conn.close()
-            
             # Also save to CSV
-            self._append_to_csv(self.trades_csv, trade)
+            self._append_to_csv(self._trades_writer, trade)
             
             logger.info(f"Trade saved: {trade.get('mt5_ticket')}")
             
@@ -270,26 +489,17 @@ class Persistence:
     
     def save_metric(self, metric_type: str, metric_name: str, metric_value: float, metadata: Dict = None):
         """
-        Save performance metric
+        Save performance metric (buffered)
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO metrics (timestamp_utc, metric_type, metric_name, metric_value, metadata)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
+            self._queue_write(_METRIC_INSERT_SQL, (
                 datetime.now(timezone.utc).isoformat(),
                 metric_type,
                 metric_name,
                 metric_value,
-                json.dumps(metadata) if metadata else None
+                _dumps(metadata) if metadata else None
             ))
             
-            conn.commit()
-            conn.close()
-            
         except Exception as e:
             logger.error(f"Error saving metric: {e}")
     
@@ -298,28 +508,28 @@ class Persistence:
         Get recent signals from database
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM signals
-                ORDER BY timestamp_utc DESC
-                LIMIT ?
-            ''', (limit,))
+            self._flush()
             
-            columns = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute('''
+                    SELECT * FROM signals
+                    ORDER BY timestamp_utc DESC
+                    LIMIT ?
+                ''', (limit,))
+                
+                columns = [desc[0] for desc in cursor.description]
+                rows = cursor.fetchall()
             
             signals = []
             for row in rows:
                 signal = dict(zip(columns, row))
                 # Parse JSON fields
                 if signal.get('zone_data'):
-                    signal['zone_data'] = json.loads(signal['zone_data'])
+                    signal['zone_data'] = _loads(signal['zone_data'])
                 if signal.get('reason_tags'):
-                    signal['reason_tags'] = json.loads(signal['reason_tags'])
+                    signal['reason_tags'] = _loads(signal['reason_tags'])
                 signals.append(signal)
             
             return signals
@@ -333,19 +543,19 @@ class Persistence:
         Get recent completed trades
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM trades
-                ORDER BY timestamp_close DESC
-                LIMIT ?
-            ''', (limit,))
-            
-            columns = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
+            self._flush()
             
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute('''
+                    SELECT * FROM trades
+                    ORDER BY timestamp_close DESC
+                    LIMIT ?
+                ''', (limit,))
+                
+                columns = [desc[0] for desc in cursor.description]
+                rows = cursor.fetchall()
             
             trades = []
             for row in rows:
@@ -363,52 +573,63 @@ class Persistence:
         Calculate performance statistics
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            
-            # Get trades from last N days
-            query = '''
-                SELECT * FROM trades
-                WHERE timestamp_close >= datetime('now', '-{} days')
+            # Aggregate trades from last N days in one row; only the profit
+            # series is fetched, for the drawdown
+            summary_query = '''
+                SELECT
+                    COUNT(*),
+                    SUM(CASE WHEN profit > 0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN profit < 0 THEN 1 ELSE 0 END),
+                    TOTAL(profit),
+                    TOTAL(commission),
+                    TOTAL(swap),
+                    AVG(CASE WHEN profit > 0 THEN profit END),
+                    AVG(CASE WHEN profit < 0 THEN profit END),
+                    TOTAL(CASE WHEN profit > 0 THEN profit END),
+                    TOTAL(CASE WHEN profit < 0 THEN profit END),
+                    AVG(duration_seconds)
+                FROM trades
+                WHERE timestamp_close >= datetime('now', ?)
+            '''
+            profit_query = '''
+                SELECT profit FROM trades
+                WHERE timestamp_close >= datetime('now', ?)
                 ORDER BY timestamp_close
-            '''.format(days)
-            
-            df = pd.read_sql_query(query, conn)
-            conn.close()
-            
-            if df.empty:
-                return {}
+            '''
+            since = (f'-{days} days',)
+            
+            self._flush()
+            with self._lock:
+                (total_trades, winning_trades, losing_trades, total_profit, total_commission,
+                 total_swap, avg_win, avg_loss, gross_profit, gross_loss,
+                 avg_duration_seconds) = self._conn.execute(summary_query, since).fetchone()
+                if total_trades == 0:
+                    return {}
+                profit = np.fromiter(
+                    (row[0] for row in self._conn.execute(profit_query, since)),
+                    dtype=np.float64, count=total_trades
+                )
             
             # Calculate statistics
-            total_trades = len(df)
-            winning_trades = len(df[df['profit'] > 0])
-            losing_trades = len(df[df['profit'] < 0])
-            
             win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
             
-            avg_win = df[df['profit'] > 0]['profit'].mean() if winning_trades > 0 else 0
-            avg_loss = df[df['profit'] < 0]['profit'].mean() if losing_trades > 0 else 0
+            avg_win = avg_win if winning_trades > 0 else 0
+            avg_loss = avg_loss if losing_trades > 0 else 0
             
-            total_profit = df['profit'].sum()
-            total_commission = df['commission'].sum() if 'commission' in df else 0
-            total_swap = df['swap'].sum() if 'swap' in df else 0
             net_profit = total_profit - total_commission - total_swap
             
-            # Calculate max drawdown
-            cumulative = df['profit'].cumsum()
-            running_max = cumulative.cummax()
+            # Calculate max drawdown (NULL profits come through as NaN)
+            cumulative = np.cumsum(np.nan_to_num(profit))
+            running_max = np.maximum.accumulate(cumulative)
             drawdown = cumulative - running_max
             max_drawdown = drawdown.min()
             
             # Calculate profit factor
-            gross_profit = df[df['profit'] > 0]['profit'].sum() if winning_trades > 0 else 0
-            gross_loss = abs(df[df['profit'] < 0]['profit'].sum()) if losing_trades > 0 else 1
+            gross_loss = abs(gross_loss) if losing_trades > 0 else 1
             profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
             
             # Calculate average trade duration
-            if 'duration_seconds' in df:
-                avg_duration = df['duration_seconds'].mean() / 3600  # Convert to hours
-            else:
-                avg_duration = 0
+            avg_duration = avg_duration_seconds / 3600 if avg_duration_seconds is not None else np.nan  # Convert to hours
             
             stats = {
                 'period_days': days,
@@ -433,34 +654,38 @@ class Persistence:
             logger.error(f"Error calculating performance stats: {e}")
             return {}
     
-    def _append_to_csv(self, filename: str, data: Dict, status: str = None):
+    def export_signals_csv(self, path: Optional[str] = None):
         """
-        Append data to CSV file
+        Write the whole signals table to CSV in one pass (defaults to signals_csv)
         """
         try:
-            # Check if file exists
-            file_exists = Path(filename).exists()
+            with self._lock:
+                df = pd.read_sql_query("SELECT * FROM signals", self._conn)
+            df.to_csv(path or self.signals_csv, index=False)
             
+        except Exception as e:
+            logger.error(f"Error exporting signals to CSV: {e}")
+    
+    def _append_to_csv(self, writer: csv.DictWriter, data: Dict, status: str = None):
+        """
+        Append data to CSV file (buffered, see _open_csv)
+        """
+        try:
             # Prepare row
             row = data.copy()
             if status:
                 row['status'] = status
             row['timestamp'] = datetime.now(timezone.utc).isoformat()
-            row = self._make_json_safe(row)
-
             
             # Convert complex types to strings
             for key, value in row.items():
                 if isinstance(value, (dict, list)):
-                    row[key] = json.dumps(value)
+                    row[key] = _dumps(value)
+                elif isinstance(value, (pd.Timestamp, datetime)):
+                    row[key] = value.isoformat()
             
             # Write to CSV
-            with open(filename, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=row.keys())
-                
-                if not file_exists:
-                    writer.writeheader()
-                
+            with self._csv_lock:
                 writer.writerow(row)
             
         except Exception as e:
@@ -480,7 +705,11 @@ class Persistence:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_file = backup_dir / f"ledger_backup_{timestamp}.sqlite"
             
-            shutil.copy2(self.db_file, backup_file)
+            # Fold the WAL into the main file so the copy is complete
+            self._flush()
+            with self._lock:
+                self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                shutil.copy2(self.db_file, backup_file)
             
             logger.info(f"Database backed up to {backup_file}")
             
@@ -492,3 +721,24 @@ class Persistence:
             
         except Exception as e:
             logger.error(f"Error backing up database: {e}")
+    
+    def close(self):
+        """
+        Flush buffered writes, stop the writer and close the database and CSV files
+        """
+        try:
+            self._closing = True
+            self._flush_event.set()
+            self._writer_thread.join(timeout=10)
+            self._flush()
+            
+            with self._lock:
+                self._conn.close()
+            
+            self._flush_csv()
+            with self._csv_lock:
+                if self._signals_csv_f is not None:
+                    self._signals_csv_f.close()
+                self._trades_csv_f.close()
+        except Exception as e:
+            logger.error(f"Error closing database: {e}")
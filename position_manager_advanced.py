@@ -8,7 +8,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -158,9 +158,13 @@ class AdvancedPositionManager:
             return None
 
     def update_position(self, ticket: int, current_price: float,
-                       mt5_client) -> Optional[Dict]:
+                       mt5_client, current_atr: Optional[float] = None,
+                       now: Optional[datetime] = None) -> Optional[Dict]:
         """
         Update position and manage trailing stop, break-even, partial profits
+        current_atr: ATR already fetched for this batch (see get_current_atr);
+        when None the dynamic ATR trailing fetches it itself
+        now: UTC time shared by the batch, defaults to the current time
         Returns action to take: {'action': 'modify_sl', 'new_sl': xxx} or None
         """
         try:
@@ -216,7 +220,7 @@ class AdvancedPositionManager:
             if self.enable_trailing_stop:
                 if self.use_dynamic_atr:
                     # NEW: Dynamic ATR + MFE system
-                    trailing_action = self._check_dynamic_atr_trailing(position, mt5_client)
+                    trailing_action = self._check_dynamic_atr_trailing(position, mt5_client, current_atr)
                 else:
                     # OLD: Standard fixed percentage trailing
                     trailing_action = self._check_trailing_stop(position)
@@ -225,7 +229,7 @@ class AdvancedPositionManager:
                     return trailing_action
 
             # Check time-based exit
-            time_action = self._check_time_exit(position)
+            time_action = self._check_time_exit(position, now)
             if time_action:
                 return time_action
 
@@ -356,24 +360,36 @@ class AdvancedPositionManager:
             logger.error(f"Error checking partial profit: {e}")
             return None
 
-    def _check_dynamic_atr_trailing(self, position: Position, mt5_client) -> Optional[Dict]:
+    def get_current_atr(self, mt5_client) -> Optional[float]:
+        """
+        Fetch the current ATR used by the dynamic trailing system
+        Call once per position check and pass the result to update_position
+        Returns None when not enough bars are available
+        """
+        try:
+            df = mt5_client.get_bars(self.atr_timeframe, self.atr_period + 20)
+            if df is not None and len(df) >= self.atr_period:
+                from indicators import Indicators
+                atr_series = Indicators.atr(df, self.atr_period)
+                if len(atr_series) > 0:
+                    return atr_series.iloc[-1]
+            return None
+
+        except Exception as e:
+            logger.warning(f"Could not get ATR, using entry ATR: {e}")
+            return None
+
+    def _check_dynamic_atr_trailing(self, position: Position, mt5_client,
+                                    current_atr: Optional[float] = None) -> Optional[Dict]:
         """
         BULLETPROOF Dynamic ATR + MFE trailing system for BTC
         Adapts to volatility and locks profit on big moves
         """
         try:
             # Get current ATR
-            try:
-                df = mt5_client.get_bars(self.atr_timeframe, self.atr_period + 20)
-                if df is not None and len(df) >= self.atr_period:
-                    from indicators import Indicators
-                    atr_series = Indicators.atr(df, self.atr_period)
-                    position.current_atr = atr_series.iloc[-1] if len(atr_series) > 0 else position.atr_at_entry
-                else:
-                    position.current_atr = position.atr_at_entry  # Fallback
-            except Exception as e:
-                logger.warning(f"Could not get ATR, using entry ATR: {e}")
-                position.current_atr = position.atr_at_entry
+            if current_atr is None:
+                current_atr = self.get_current_atr(mt5_client)
+            position.current_atr = current_atr if current_atr is not None else position.atr_at_entry  # Fallback
 
             # Calculate profit in points
             if position.side == 'BUY':
@@ -484,10 +500,12 @@ class AdvancedPositionManager:
             # Fallback to standard trailing
             return self._check_trailing_stop(position)
 
-    def _check_time_exit(self, position: Position) -> Optional[Dict]:
+    def _check_time_exit(self, position: Position, now: Optional[datetime] = None) -> Optional[Dict]:
         """Check if position should be closed due to time limit"""
         try:
-            hours_held = (datetime.utcnow() - position.open_time).total_seconds() / 3600
+            if now is None:
+                now = datetime.now(timezone.utc)
+            hours_held = (now - position.open_time).total_seconds() / 3600
 
             if hours_held >= self.max_position_hold_hours:
                 logger.info(f"Time-based exit for position {position.ticket}: "
@@ -540,7 +558,7 @@ class AdvancedPositionManager:
                 'max_loss_pct': position.max_loss_reached,
                 'break_even_active': position.break_even_activated,
                 'partial_profits_taken': len(position.partial_profit_taken),
-                'hours_held': (datetime.utcnow() - position.open_time).total_seconds() / 3600
+                'hours_held': (datetime.now(timezone.utc) - position.open_time).total_seconds() / 3600
             }
 
         except Exception as e:
@@ -631,7 +649,7 @@ class AdvancedPositionManager:
 
             total_hours = 0
             for position in self.positions.values():
-                hours = (datetime.utcnow() - position.open_time).total_seconds() / 3600
+                hours = (datetime.now(timezone.utc) - position.open_time).total_seconds() / 3600
                 total_hours += hours
 
             return total_hours / len(self.positions)
@@ -67,8 +67,8 @@ class RiskManager:
                 logger.error("Symbol info not available")
                 return 0.0
 
-            point = symbol_info['point']
-            contract_size = symbol_info['contract_size']
+            point = symbol_info.point
+            contract_size = symbol_info.contract_size
 
             # Safety check: point should never be 0, but validate
             if point <= 0:
@@ -83,8 +83,8 @@ class RiskManager:
             # For gold, typically: contract_size = 100, point = 0.01, point_value varies
 
             # Get tick value for proper calculation
-            tick_value = symbol_info.get('tick_value', 1.0)
-            tick_size = symbol_info.get('tick_size', point)
+            tick_value = symbol_info.tick_value
+            tick_size = symbol_info.tick_size
 
             if tick_size > 0 and tick_value > 0:
                 # Proper lot calculation
@@ -128,9 +128,9 @@ class RiskManager:
             if not symbol_info:
                 return 0.01  # Default minimum
             
-            min_lot = symbol_info['min_lot']
-            max_lot = symbol_info['max_lot']
-            lot_step = symbol_info['lot_step']
+            min_lot = symbol_info.min_lot
+            max_lot = symbol_info.max_lot
+            lot_step = symbol_info.lot_step
             
             # Clamp to min/max
             lots = max(min_lot, min(lots, max_lot))
@@ -265,7 +265,7 @@ class RiskManager:
                         sl_distance = abs(entry - sl)
                         symbol_info = self.mt5_client.symbol_info
                         if symbol_info:
-                            contract_size = symbol_info['contract_size']
+                            contract_size = symbol_info.contract_size
                             position_risk = volume * sl_distance * contract_size
                             total_risk += position_risk
             
@@ -312,7 +312,7 @@ class RiskManager:
             
             # Simple margin calculation (varies by broker)
             estimated_lots = 0.01  # Use minimum for estimation
-            contract_size = symbol_info['contract_size']
+            contract_size = symbol_info.contract_size
             leverage = account.get('leverage', 1)
             
             required_margin = (signal['entry_price'] * estimated_lots * contract_size) / leverage
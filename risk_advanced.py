@@ -6,13 +6,17 @@ and adaptive position sizing
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime, timedelta, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Trades in the rolling window behind the optimized lot size's Kelly inputs
+KELLY_WINDOW = 20
+
 
 @dataclass
 class RiskMetrics:
@@ -42,6 +46,110 @@ class PositionRisk:
     kelly_fraction: float
 
 
+class RollingKellyStats:
+    """
+    Win rate and average win/loss over the last `window` trades
+    Running counts and sums are adjusted as trades enter and leave the window,
+    so reading the stats never iterates the history
+    """
+
+    def __init__(self, window: int = KELLY_WINDOW):
+        # A window below one trade would never fill and could not be evicted from
+        self.window = max(1, window)
+        self.trades = deque(maxlen=self.window)
+        self.n_wins = 0
+        self.sum_win = 0.0
+        self.n_losses = 0
+        self.sum_loss = 0.0
+
+    def add(self, profit: float, is_win: bool):
+        """Add a closed trade, evicting the oldest one once the window is full"""
+        if len(self.trades) == self.window:
+            self._apply(*self.trades[0], sign=-1)
+        self.trades.append((profit, is_win))
+        self._apply(profit, is_win, sign=1)
+
+    def _apply(self, profit: float, is_win: bool, sign: int):
+        if is_win:
+            self.n_wins += sign
+            self.sum_win += sign * profit
+        else:
+            self.n_losses += sign
+            self.sum_loss += sign * profit
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.trades) == self.window
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        """Win rate over a full window, None until enough trades are recorded"""
+        return self.n_wins / self.window if self.is_full else None
+
+    @property
+    def avg_win(self) -> Optional[float]:
+        if not self.is_full:
+            return None
+        return abs(self.sum_win / self.n_wins) if self.n_wins else 0
+
+    @property
+    def avg_loss(self) -> Optional[float]:
+        if not self.is_full:
+            return None
+        return abs(self.sum_loss / self.n_losses) if self.n_losses else 0
+
+
+class TradeHistory:
+    """
+    Last `capacity` closed trades stored column-wise in preallocated arrays
+    Columns are read back oldest-first, ready for vectorised metric math
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self._timestamp = np.empty(capacity)
+        self._profit = np.empty(capacity)
+        self._risk_amount = np.empty(capacity)
+        self._rr_ratio = np.empty(capacity)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, timestamp: float, profit: float, risk_amount: float, rr_ratio: float):
+        """Record a closed trade, overwriting the oldest one once full"""
+        i = self._head
+        self._timestamp[i] = timestamp
+        self._profit[i] = profit
+        self._risk_amount[i] = risk_amount
+        self._rr_ratio[i] = rr_ratio
+        self._head = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _ordered(self, column: np.ndarray) -> np.ndarray:
+        if self._count < self.capacity:
+            return column[:self._count]
+        return np.concatenate((column[self._head:], column[:self._head]))
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        """Close times as POSIX seconds (UTC)"""
+        return self._ordered(self._timestamp)
+
+    @property
+    def profit(self) -> np.ndarray:
+        return self._ordered(self._profit)
+
+    @property
+    def risk_amount(self) -> np.ndarray:
+        return self._ordered(self._risk_amount)
+
+    @property
+    def rr_ratio(self) -> np.ndarray:
+        return self._ordered(self._rr_ratio)
+
+
 class AdvancedRiskManager:
     """
     Professional hedge fund-grade risk management
@@ -82,10 +190,13 @@ class AdvancedRiskManager:
         self.weekly_reset_time = None
         self.monthly_reset_time = None
 
-        # Trade history for statistics
-        self.trade_history: List[Dict] = []
+        # Trade history for statistics (last 100 trades)
+        self.trade_history = TradeHistory(capacity=100)
         self.recent_losses = 0
 
+        # Rolling Kelly inputs over the most recent trades
+        self.kelly_stats = RollingKellyStats(window=KELLY_WINDOW)
+
         logger.info("Advanced Risk Manager initialized")
 
     def calculate_kelly_criterion(self, win_rate: float, avg_win: float,
@@ -261,7 +372,7 @@ class AdvancedRiskManager:
     def reset_daily_limits(self, current_balance: float):
         """Reset daily tracking"""
         self.daily_pnl = 0.0
-        self.daily_reset_time = datetime.utcnow()
+        self.daily_reset_time = datetime.now(timezone.utc)
 
         # Update peak balance for drawdown calculation
         if current_balance > self.peak_balance:
@@ -270,28 +381,25 @@ class AdvancedRiskManager:
     def reset_weekly_limits(self):
         """Reset weekly tracking"""
         self.weekly_pnl = 0.0
-        self.weekly_reset_time = datetime.utcnow()
+        self.weekly_reset_time = datetime.now(timezone.utc)
 
     def reset_monthly_limits(self):
         """Reset monthly tracking"""
         self.monthly_pnl = 0.0
-        self.monthly_reset_time = datetime.utcnow()
+        self.monthly_reset_time = datetime.now(timezone.utc)
 
     def add_trade_to_history(self, trade: Dict):
         """Add completed trade to history for statistics"""
         try:
-            self.trade_history.append({
-                'timestamp': datetime.utcnow(),
-                'symbol': trade.get('symbol'),
-                'profit': trade.get('profit', 0),
-                'is_win': trade.get('profit', 0) > 0,
-                'risk_amount': trade.get('risk_amount', 0),
-                'rr_ratio': trade.get('rr_ratio', 0),
-            })
-
-            # Keep only recent history (last 100 trades)
-            if len(self.trade_history) > 100:
-                self.trade_history = self.trade_history[-100:]
+            profit = trade.get('profit', 0)
+            is_win = profit > 0
+            self.trade_history.add(
+                datetime.now(timezone.utc).timestamp(),
+                profit,
+                trade.get('risk_amount', 0),
+                trade.get('rr_ratio', 0),
+            )
+            self.kelly_stats.add(profit, is_win)
 
         except Exception as e:
             logger.error(f"Error adding trade to history: {e}")
@@ -308,46 +416,43 @@ class AdvancedRiskManager:
                 return RiskMetrics(0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
             # Calculate statistics
-            wins = [t for t in self.trade_history if t['is_win']]
-            losses = [t for t in self.trade_history if not t['is_win']]
+            profits = self.trade_history.profit
+            is_win = profits > 0
+            wins = profits[is_win]
+            losses = profits[~is_win]
 
-            win_rate = len(wins) / len(self.trade_history) if self.trade_history else 0
-            avg_win = np.mean([t['profit'] for t in wins]) if wins else 0
-            avg_loss = abs(np.mean([t['profit'] for t in losses])) if losses else 0
+            win_rate = wins.size / profits.size
+            avg_win = wins.mean() if wins.size else 0
+            avg_loss = abs(losses.mean()) if losses.size else 0
 
             # Total exposure
-            total_exposure = sum([t['risk_amount'] for t in self.trade_history[-10:]])  # Last 10 trades
-
-            # Calculate drawdown
-            balance_curve = [account_balance]
-            for trade in self.trade_history:
-                balance_curve.append(balance_curve[-1] + trade['profit'])
+            total_exposure = self.trade_history.risk_amount[-10:].sum()  # Last 10 trades
 
-            peak = balance_curve[0]
-            max_dd = 0
-            for balance in balance_curve:
-                if balance > peak:
-                    peak = balance
-                dd = (peak - balance) / peak if peak > 0 else 0
-                max_dd = max(max_dd, dd)
+            # Calculate drawdown (peak stays positive: balance was checked above)
+            balance_curve = np.cumsum(np.concatenate(([account_balance], profits)))
+            peaks = np.maximum.accumulate(balance_curve)
+            max_dd = ((peaks - balance_curve) / peaks).max()
 
             # Sharpe ratio (simplified)
-            returns = [t['profit'] / account_balance for t in self.trade_history]
+            returns = profits / account_balance
+            mean_return = returns.mean()
             if len(returns) > 1:
-                sharpe = np.mean(returns) / np.std(returns) if np.std(returns) > 0 else 0
+                std_return = returns.std()
+                sharpe = mean_return / std_return if std_return > 0 else 0
             else:
                 sharpe = 0
 
             # Sortino ratio (only downside deviation)
-            negative_returns = [r for r in returns if r < 0]
-            if negative_returns:
-                sortino = np.mean(returns) / np.std(negative_returns) if np.std(negative_returns) > 0 else 0
+            negative_returns = returns[returns < 0]
+            if negative_returns.size:
+                downside_std = negative_returns.std()
+                sortino = mean_return / downside_std if downside_std > 0 else 0
             else:
                 sortino = sharpe
 
             # Profit factor
-            total_wins = sum([t['profit'] for t in wins])
-            total_losses = abs(sum([t['profit'] for t in losses]))
+            total_wins = wins.sum()
+            total_losses = abs(losses.sum())
             profit_factor = total_wins / total_losses if total_losses > 0 else 0
 
             # Expectancy
@@ -10,12 +10,22 @@ from typing import Optional, Dict, List, Tuple
 import logging
 import hashlib
 import json
+from concurrent.futures import wait
+from functools import lru_cache
 
 from indicators import Indicators
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _session_bounds(start_str: str, end_str: str) -> Tuple[int, int]:
+    """Parse 'HH:MM' session bounds into minutes of the day (parsed once per config value)"""
+    start_hour, start_min = map(int, start_str.split(':'))
+    end_hour, end_min = map(int, end_str.split(':'))
+    return start_hour * 60 + start_min, end_hour * 60 + end_min
+
+
 class SignalEngine:
     """
     Generates trading signals based on ICT concepts and multi-timeframe analysis
@@ -27,26 +37,38 @@ class SignalEngine:
         self.indicators = Indicators()
         self.last_signal_time = None
         self.signal_history = []
+        # Last analysis per timeframe, keyed on the state of the forming bar
+        self._analysis_cache: Dict[str, Tuple[Tuple, Dict]] = {}
         
     def analyze(self) -> Optional[Dict]:
         """
         Main analysis method - performs multi-timeframe analysis and generates signals
         """
         try:
-            # Get multi-timeframe data
-            htf_data = self.mt5_client.get_bars(self.config['timeframes']['high'], 100)
-            mtf_data = self.mt5_client.get_bars(self.config['timeframes']['med'], 100)
-            ltf_data = self.mt5_client.get_bars(self.config['timeframes']['low'], 50)
+            # Get multi-timeframe data; later fetches run on the MT5 worker
+            # while earlier timeframes are analysed
+            futures = [
+                self.mt5_client.get_bars_async(self.config['timeframes']['high'], 100),
+                self.mt5_client.get_bars_async(self.config['timeframes']['med'], 100),
+                self.mt5_client.get_bars_async(self.config['timeframes']['low'], 50),
+            ]
+            try:
+                htf_data = futures[0].result()
+                htf_analysis = self._analyze_timeframe(htf_data, 'high') if htf_data is not None else None
+                
+                mtf_data = futures[1].result()
+                mtf_analysis = self._analyze_timeframe(mtf_data, 'medium') if mtf_data is not None else None
+                
+                ltf_data = futures[2].result()
+                ltf_analysis = self._analyze_timeframe(ltf_data, 'low') if ltf_data is not None else None
+            finally:
+                # Never leave a fetch running before the next MT5 call below
+                wait(futures)
             
             if htf_data is None or mtf_data is None:
                 logger.warning("Failed to get necessary timeframe data")
                 return None
             
-            # Calculate indicators on each timeframe
-            htf_analysis = self._analyze_timeframe(htf_data, 'high')
-            mtf_analysis = self._analyze_timeframe(mtf_data, 'medium')
-            ltf_analysis = self._analyze_timeframe(ltf_data, 'low') if ltf_data is not None else None
-            
             # Check market conditions
             if not self._check_market_conditions():
                 return None
@@ -92,6 +114,16 @@ class SignalEngine:
             if len(df) < 30:
                 return analysis
             
+            # Closed bars never change, so an unchanged forming bar means the
+            # whole window (and every indicator below) is unchanged
+            cache_key = (
+                df.index[-1], len(df),
+                df['high'].iat[-1], df['low'].iat[-1], df['close'].iat[-1]
+            )
+            cached = self._analysis_cache.get(timeframe)
+            if cached is not None and cached[0] == cache_key:
+                return cached[1]
+            
             # Calculate EMA
             ema_period = self.config.get('ema_high', 21)
             df['ema'] = self.indicators.ema(df, ema_period)
@@ -123,7 +155,7 @@ class SignalEngine:
             # Detect Fair Value Gaps
             if timeframe in ['medium', 'low']:
                 min_fvg_points = self.config.get('fvg_min_size_points', 3)
-                point_value = self.mt5_client.symbol_info['point'] if self.mt5_client.symbol_info else 0.01
+                point_value = self.mt5_client.symbol_info.point if self.mt5_client.symbol_info else 0.01
                 analysis['fvgs'] = self.indicators.detect_fair_value_gaps(df, min_fvg_points, point_value)
             
             # Detect Market Structure
@@ -132,11 +164,12 @@ class SignalEngine:
             # Detect Liquidity Sweeps
             if timeframe == 'medium':
                 sweep_points = self.config.get('liquidity_sweep_points', 2)
-                point_value = self.mt5_client.symbol_info['point'] if self.mt5_client.symbol_info else 0.01
+                point_value = self.mt5_client.symbol_info.point if self.mt5_client.symbol_info else 0.01
                 analysis['liquidity_sweeps'] = self.indicators.detect_liquidity_sweeps(
                     df, pivots, sweep_points, point_value
                 )
             
+            self._analysis_cache[timeframe] = (cache_key, analysis)
             return analysis
             
         except Exception as e:
@@ -155,8 +188,8 @@ class SignalEngine:
             
             # Check spread
             max_spread = self.config.get('max_spread', 200.0)
-            if tick['spread'] > max_spread:
-                logger.info(f"Spread too high: {tick['spread']} > {max_spread}")
+            if tick.spread > max_spread:
+                logger.info(f"Spread too high: {tick.spread} > {max_spread}")
                 return False
             
             # Check trading sessions
@@ -196,15 +229,11 @@ class SignalEngine:
             if not session_config:
                 return True
             
-            start_str = session_config.get('start', '00:00')
-            end_str = session_config.get('end', '23:59')
-            
-            start_hour, start_min = map(int, start_str.split(':'))
-            end_hour, end_min = map(int, end_str.split(':'))
-            
+            start_minutes, end_minutes = _session_bounds(
+                session_config.get('start', '00:00'),
+                session_config.get('end', '23:59')
+            )
             current_minutes = current_time.hour * 60 + current_time.minute
-            start_minutes = start_hour * 60 + start_min
-            end_minutes = end_hour * 60 + end_min
             
             # Handle sessions that cross midnight
             if start_minutes <= end_minutes:
@@ -231,7 +260,7 @@ class SignalEngine:
             if not tick:
                 return None
             
-            current_price = tick['ask'] if htf['trend'] == 'bullish' else tick['bid']
+            current_price = tick.ask if htf['trend'] == 'bullish' else tick.bid
             
             # Initialize signal scoring
             signal_score = 0
@@ -345,7 +374,7 @@ class SignalEngine:
             
             # Round prices to symbol digits
             if self.mt5_client.symbol_info:
-                digits = self.mt5_client.symbol_info['digits']
+                digits = self.mt5_client.symbol_info.digits
                 entry_price = round(entry_price, digits)
                 sl_price = round(sl_price, digits)
                 tp_price = round(tp_price, digits)
@@ -435,11 +464,11 @@ class SignalEngine:
                 return False
             
             # Check if entry price is at minimum distance from current price
-            current_price = tick['ask'] if signal['side'] == 'BUY' else tick['bid']
+            current_price = tick.ask if signal['side'] == 'BUY' else tick.bid
             min_distance_points = self.config.get('min_distance_points', 6)
             
             if self.mt5_client.symbol_info:
-                point = self.mt5_client.symbol_info['point']
+                point = self.mt5_client.symbol_info.point
                 min_distance = min_distance_points * point
                 
                 distance = abs(current_price - signal['entry_price'])
@@ -449,9 +478,9 @@ class SignalEngine:
             
             # Check stops level
             if self.mt5_client.symbol_info:
-                stops_level = self.mt5_client.symbol_info.get('stops_level', 0)
+                stops_level = self.mt5_client.symbol_info.stops_level
                 if stops_level > 0:
-                    stops_distance = stops_level * self.mt5_client.symbol_info['point']
+                    stops_distance = stops_level * self.mt5_client.symbol_info.point
                     
                     sl_distance = abs(signal['entry_price'] - signal['sl_price'])
                     tp_distance = abs(signal['entry_price'] - signal['tp_price'])
@@ -109,6 +109,21 @@ class SmallCapitalOptimizer:
         """
         Determine if signal meets small capital criteria
 
+        Returns:
+            (should_take, reason)
+        """
+        should_take, reason = self.should_take_cheap(signal, balance, daily_trades)
+        if not should_take:
+            return should_take, reason
+
+        return self.should_take_full(signal, balance, daily_trades)
+
+    def should_take_cheap(self, signal: Dict, balance: float,
+                          daily_trades: int = 0) -> Tuple[bool, str]:
+        """
+        Small capital checks that only need the base signal (score, daily
+        trade count, R:R), so they can run before the advanced indicators
+
         Returns:
             (should_take, reason)
         """
@@ -155,6 +170,24 @@ class SmallCapitalOptimizer:
             if signal_rr < required_rr:
                 return False, f"R:R {signal_rr:.2f} below threshold {required_rr} for {tier} account"
 
+            return True, "Signal meets small capital criteria"
+
+        except Exception as e:
+            logger.error(f"Error checking signal for small capital: {e}")
+            return False, f"Error: {e}"
+
+    def should_take_full(self, signal: Dict, balance: float,
+                         daily_trades: int = 0) -> Tuple[bool, str]:
+        """
+        Small capital checks that depend on the advanced indicator fields
+        (kill zone, ML confidence); run after should_take_cheap passes
+
+        Returns:
+            (should_take, reason)
+        """
+        try:
+            tier = self.get_account_tier(balance)
+
             # For micro accounts, ONLY trade during kill zones
             if tier == 'micro':
                 is_killzone = signal.get('in_killzone', False)
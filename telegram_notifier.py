@@ -3,10 +3,11 @@ Telegram Notification System
 Sends real-time alerts and performance updates to Telegram
 """
 
+import sys
 import logging
 import asyncio
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from dataclasses import dataclass
 
 try:
@@ -17,6 +18,18 @@ except ImportError:
     TELEGRAM_AVAILABLE = False
     logging.warning("python-telegram-bot not available. Install with: pip install python-telegram-bot")
 
+# Faster event loop for the notifier when available (winloop is the Windows port)
+try:
+    if sys.platform == 'win32':
+        import winloop as uvloop
+    else:
+        import uvloop
+    new_event_loop = uvloop.new_event_loop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    new_event_loop = asyncio.new_event_loop
+    UVLOOP_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +57,9 @@ class TelegramNotifier:
         self.bot: Optional[Bot] = None
         self.application: Optional[Application] = None
 
+        # Long-lived loop driving the *_sync wrappers, created on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
         if not TELEGRAM_AVAILABLE:
             logger.warning("Telegram notifications disabled - library not installed")
             self.config.enabled = False
@@ -61,6 +77,24 @@ class TelegramNotifier:
             logger.error(f"Error initializing Telegram bot: {e}")
             self.config.enabled = False
 
+    def _run(self, coro):
+        """Run a coroutine to completion on the notifier's event loop"""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        """Close the event loop used by the *_sync wrappers"""
+        try:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+                self._loop.close()
+            self._loop = None
+
+        except Exception as e:
+            logger.error(f"Error closing Telegram event loop: {e}")
+
     async def send_message(self, message: str, parse_mode: str = 'HTML'):
         """Send a message to Telegram"""
         try:
@@ -82,10 +116,7 @@ class TelegramNotifier:
             if not self.config.enabled:
                 return
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.send_message(message, parse_mode))
-            loop.close()
+            self._run(self.send_message(message, parse_mode))
 
         except Exception as e:
             logger.error(f"Error in sync message send: {e}")
@@ -99,7 +130,7 @@ class TelegramNotifier:
             message = f"""
 🚀 <b>{bot_name} Started</b>
 
-⏰ Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
+⏰ Time: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC
 
 📊 <b>Configuration:</b>
 • Symbols: {', '.join(config_summary.get('symbols', []))}
@@ -138,7 +169,7 @@ class TelegramNotifier:
 • Zone Type: {signal.get('zone_type', 'N/A')}
 • HTF Trend: {signal.get('htf_trend', 'N/A')}
 
-⏰ {datetime.utcnow().strftime('%H:%M:%S')} UTC
+⏰ {datetime.now(timezone.utc).strftime('%H:%M:%S')} UTC
 """
 
             await self.send_message(message)
@@ -169,7 +200,7 @@ class TelegramNotifier:
 💵 <b>Risk:</b> ${trade.get('risk_amount', 0):.2f} ({trade.get('risk_pct', 0):.2f}%)
 📈 <b>Potential Profit:</b> ${trade.get('potential_profit', 0):.2f}
 
-⏰ {datetime.utcnow().strftime('%H:%M:%S')} UTC
+⏰ {datetime.now(timezone.utc).strftime('%H:%M:%S')} UTC
 """
 
             await self.send_message(message)
@@ -201,7 +232,7 @@ class TelegramNotifier:
 
 <b>Reason:</b> {trade.get('close_reason', 'N/A')}
 
-⏰ {datetime.utcnow().strftime('%H:%M:%S')} UTC
+⏰ {datetime.now(timezone.utc).strftime('%H:%M:%S')} UTC
 """
 
             await self.send_message(message)
@@ -244,7 +275,7 @@ class TelegramNotifier:
                 message += f"💰 <b>Closed:</b> {modification.get('closed_volume', 0):.2f} lots\n"
                 message += f"💵 <b>Profit:</b> ${modification.get('profit', 0):.2f}\n"
 
-            message += f"\n⏰ {datetime.utcnow().strftime('%H:%M:%S')} UTC"
+            message += f"\n⏰ {datetime.now(timezone.utc).strftime('%H:%M:%S')} UTC"
 
             await self.send_message(message)
 
@@ -270,7 +301,7 @@ class TelegramNotifier:
 <b>Message:</b>
 {error_message}
 
-⏰ {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
+⏰ {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC
 """
 
             await self.send_message(message)
@@ -309,7 +340,7 @@ class TelegramNotifier:
 • Equity: ${summary.get('equity', 0):.2f}
 • Max Drawdown: {summary.get('max_drawdown', 0):.2f}%
 
-📅 {summary.get('date', datetime.utcnow().strftime('%Y-%m-%d'))}
+📅 {summary.get('date', datetime.now(timezone.utc).strftime('%Y-%m-%d'))}
 """
 
             await self.send_message(message)
@@ -335,7 +366,7 @@ class TelegramNotifier:
 
 🛑 <b>Action:</b> Trading halted
 
-⏰ {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
+⏰ {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC
 """
 
             await self.send_message(message)
@@ -356,7 +387,7 @@ class TelegramNotifier:
 📊 <b>New Regime:</b> {new_regime.replace('_', ' ').title()}
 📈 <b>Confidence:</b> {confidence:.1%}
 
-⏰ {datetime.utcnow().strftime('%H:%M:%S')} UTC
+⏰ {datetime.now(timezone.utc).strftime('%H:%M:%S')} UTC
 """
 
             await self.send_message(message)
@@ -371,59 +402,41 @@ class TelegramNotifier:
     def notify_signal_generated_sync(self, signal: Dict):
         """Synchronous wrapper"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.notify_signal_generated(signal))
-            loop.close()
+            self._run(self.notify_signal_generated(signal))
         except Exception as e:
             logger.error(f"Error in sync signal notification: {e}")
 
     def notify_trade_opened_sync(self, trade: Dict):
         """Synchronous wrapper"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.notify_trade_opened(trade))
-            loop.close()
+            self._run(self.notify_trade_opened(trade))
         except Exception as e:
             logger.error(f"Error in sync trade opened notification: {e}")
 
     def notify_trade_closed_sync(self, trade: Dict):
         """Synchronous wrapper"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.notify_trade_closed(trade))
-            loop.close()
+            self._run(self.notify_trade_closed(trade))
         except Exception as e:
             logger.error(f"Error in sync trade closed notification: {e}")
 
     def notify_error_sync(self, error_type: str, error_message: str, severity: str = 'ERROR'):
         """Synchronous wrapper"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.notify_error(error_type, error_message, severity))
-            loop.close()
+            self._run(self.notify_error(error_type, error_message, severity))
         except Exception as e:
             logger.error(f"Error in sync error notification: {e}")
 
     def notify_position_modified_sync(self, modification: Dict):
         """Synchronous wrapper"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.notify_position_modified(modification))
-            loop.close()
+            self._run(self.notify_position_modified(modification))
         except Exception as e:
             logger.error(f"Error in sync position modification notification: {e}")
 
     def notify_risk_limit_reached_sync(self, limit_type: str, details: Dict):
         """Synchronous wrapper"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.notify_risk_limit_reached(limit_type, details))
-            loop.close()
+            self._run(self.notify_risk_limit_reached(limit_type, details))
         except Exception as e:
             logger.error(f"Error in sync risk limit notification: {e}")